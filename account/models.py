@@ -8,6 +8,9 @@ from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
 # Sets password for user to encrypted version of password
 from django.contrib.auth.hashers import make_password
 
+# apps allows the tournament table to be used without importing the tournament app, which itself imports this table
+from django.apps import apps
+
 # Functions which can be run to manually create users
 class UserManager(BaseUserManager):
     # Create user with normal status
@@ -78,16 +81,10 @@ class User(AbstractBaseUser):
     def getRequests(self):
         return [request.team for request in self.request_set.all()]
 
-    # Returns the teams the user has requested to join
+    # Returns the tournaments the teams the user belongs to are enrolled in, most recent first
+    # Each tournament is only included once, however many of the user's teams are enrolled in it
     def getTournaments(self):
-        tournaments = []
-
-        for team in self.getTeams():
-            for enrollment in team.enrollment_set.all():
-                if enrollment.tournament not in tournaments:
-                    tournaments.append(enrollment.tournament)
-
-        return tournaments
+        return apps.get_model("tournament", "Tournament").objects.filter(enrollment__team__membership__user = self).distinct().order_by("-startDate", "-id")
 
     # Returns whether the user is an admin or not as there is no separate staff
     @property
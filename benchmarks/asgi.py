@@ -0,0 +1,130 @@
+# Compares serving match-day readers through the WSGI and ASGI entry points, with a load generator in this process
+# WSGI is served by a fixed pool of threads, like a server with that many sync workers, and ASGI by one event loop
+# Each scenario sends page requests while clients wait on the score feed, and reports how long readers waited for their pages
+# Run from the project root with: python3 -m benchmarks.asgi
+import asyncio
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from wsgiref.util import setup_testing_defaults
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mysite.settings")
+
+# The benchmark uses its own database, so the development database is left alone
+from django.conf import settings
+settings.DATABASES["default"]["NAME"] = os.path.join(tempfile.mkdtemp(), "benchmark.sqlite3")
+settings.DEBUG = False
+
+from mysite.asgi import application as asgiApplication
+from mysite.wsgi import application as wsgiApplication
+
+from django.core.management import call_command
+from django.urls import reverse
+
+from team import models as teamModels
+from tournament import models
+from tournament.schedule import commitSchedule, bumpScheduleVersion
+from utils.organise import getTournament
+
+# The number of threads serving WSGI requests
+WSGI_WORKERS = 4
+
+# The seconds each client waits on the score feed for new scores
+FEED_TIMEOUT = 1
+
+# Creates a tournament with a layout chosen for the number of teams given
+def createTournament(numOfTeams):
+    call_command("migrate", verbosity = 0)
+    teamModels.Team.objects.get_or_create(id = models.BYE_TEAM_ID, defaults = {"name": "BYE"})
+
+    tournament = models.Tournament.objects.create(name = "Benchmark", location = "Benchmark", pitches = 4, halfDuration = 10, halfTimeDuration = 5, swapTeamsDuration = 3, startDate = "2021-01-01", startTime = "10:30")
+    teams = [teamModels.Team.objects.create(name = "Team {}".format(i)) for i in range(numOfTeams)]
+    for team in teams:
+        models.Enrollment.objects.create(tournament = tournament, team = team, organiser = team == teams[0])
+
+    commitSchedule(tournament, getTournament(teams, 4, 10, 5, 3, 10, 30, 1))
+    bumpScheduleVersion(tournament, layoutChanged = True)
+    return tournament
+
+# Returns the status of a GET request to the WSGI application
+def getThroughWSGI(path, query):
+    environ = {"REQUEST_METHOD": "GET", "PATH_INFO": path, "QUERY_STRING": query, "HTTP_HOST": "localhost"}
+    setup_testing_defaults(environ)
+    status = []
+    body = wsgiApplication(environ, lambda responseStatus, headers: status.append(responseStatus))
+    b"".join(body)
+    body.close()
+    return int(status[0].split()[0])
+
+# Returns the status of a GET request to the ASGI application
+async def getThroughASGI(path, query):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "path": path, "raw_path": path.encode(), "query_string": query.encode(), "root_path": "", "scheme": "http", "headers": [(b"host", b"localhost")], "server": ("localhost", 80), "client": ("127.0.0.1", 0)}
+    await asgiApplication(scope, receive, send)
+    return messages[0]["status"]
+
+# Returns the total seconds taken and the median and slowest seconds a page took, serving the requests through WSGI
+# The clients waiting on the score feed are sent first, as they would already be waiting when readers arrive
+def runWSGI(pages, feeds):
+    timings = []
+
+    # Pages are timed from when they are sent, so the time spent waiting for a free thread is included
+    def getPage(path, sent):
+        getThroughWSGI(path, "")
+        timings.append(perf_counter() - sent)
+
+    start = perf_counter()
+    with ThreadPoolExecutor(max_workers = WSGI_WORKERS) as pool:
+        for (path, query) in feeds:
+            pool.submit(getThroughWSGI, path, query)
+        for path in pages:
+            pool.submit(getPage, path, perf_counter())
+    return summarise(perf_counter() - start, timings)
+
+# Returns the total seconds taken and the median and slowest seconds a page took, serving the requests through ASGI
+def runASGI(pages, feeds):
+    timings = []
+
+    async def getPage(path):
+        start = perf_counter()
+        await getThroughASGI(path, "")
+        timings.append(perf_counter() - start)
+
+    async def run():
+        await asyncio.gather(*[getThroughASGI(path, query) for (path, query) in feeds], *[getPage(path) for path in pages])
+
+    start = perf_counter()
+    asyncio.run(run())
+    return summarise(perf_counter() - start, timings)
+
+# Returns the total seconds along with the median and slowest of the page timings
+def summarise(seconds, timings):
+    timings.sort()
+    return seconds, timings[len(timings) // 2], timings[-1]
+
+def main():
+    tournament = createTournament(40)
+    feed = (reverse("tournament:scoreFeed", args = [tournament.pk]), "since={}&timeout={}".format(tournament.scheduleVersion, FEED_TIMEOUT))
+    pages = [reverse("tournament:tournament", args = [tournament.pk]), reverse("tournament:standings", args = [tournament.pk]), reverse("team:team", args = [2])]
+
+    # Warms up both entry points, so the first requests do not include loading templates and modules
+    runWSGI(pages, [])
+    runASGI(pages, [])
+
+    print("{:>8} {:>6} {:>8} {:>10} {:>14} {:>15}".format("server", "pages", "waiting", "total s", "page median ms", "page slowest ms"))
+    for numOfFeeds in (0, 8, 64):
+        for numOfPages in (30, 150):
+            for (name, run) in (("wsgi", runWSGI), ("asgi", runASGI)):
+                (seconds, median, slowest) = run(pages * (numOfPages // len(pages)), [feed] * numOfFeeds)
+                print("{:>8} {:>6} {:>8} {:>10.2f} {:>14.1f} {:>15.1f}".format(name, numOfPages, numOfFeeds, seconds, median * 1000, slowest * 1000))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# Compares the memory held by the tournament objects and the compact tournaments returned by organise.main
+# Run from the project root with: python3 -m benchmarks.compactTournament
+import tracemalloc
+from time import perf_counter
+
+from utils.organise import main as organise
+from utils.shapeCache import shapeCache
+
+# Returns the number of candidates, the bytes of memory they hold and the seconds taken to build them
+# The shape cache is emptied first and every game is calculated, so the compact tournaments are measured at their largest
+def measure(teams, numOfPitches, compact):
+    shapeCache.clear()
+    tracemalloc.start()
+    start = perf_counter()
+    tournaments = organise(teams, numOfPitches, 10, 5, 5, 9, 0, compact = compact)
+    if compact == True:
+        for tournament in tournaments:
+            tournament.getGames()
+    seconds = perf_counter() - start
+    (current, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(tournaments), current, seconds
+
+def main():
+    print("{:>6} {:>8} {:>11} {:>14} {:>14} {:>10} {:>10} {:>10}".format("teams", "pitches", "candidates", "objects (KB)", "compact (KB)", "reduction", "objects s", "compact s"))
+
+    for numOfTeams in (50, 100, 200, 300, 500):
+        for numOfPitches in (2, 4, 8, 16):
+            teams = ["Team {}".format(i) for i in range(numOfTeams)]
+            (numOfCandidates, objects, objectsSeconds) = measure(teams, numOfPitches, False)
+            (numOfCandidates, compact, compactSeconds) = measure(teams, numOfPitches, True)
+            print("{:>6} {:>8} {:>11} {:>14.1f} {:>14.1f} {:>9.1f}x {:>10.3f} {:>10.3f}".format(numOfTeams, numOfPitches, numOfCandidates, objects / 1024, compact / 1024, objects / compact, objectsSeconds, compactSeconds))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+# Times enumerating every candidate layout, and calculating all of their games, for a range of tournament sizes and group size limits
+# Run from the project root with: python3 -m benchmarks.organise
+from time import perf_counter
+
+from utils.organise import iterTournaments
+from utils.shapeCache import shapeCache
+
+# Returns the number of candidates, the total number of games and the seconds taken to enumerate the candidates and to calculate their games
+def measure(numOfTeams, numOfPitches, minGroupSize, maxGroupSize):
+    shapeCache.clear()
+    teams = ["Team {}".format(i) for i in range(numOfTeams)]
+
+    start = perf_counter()
+    tournaments = list(iterTournaments(teams, numOfPitches, 10, 5, 5, 9, 0, minGroupSize, maxGroupSize))
+    enumerated = perf_counter()
+    for tournament in tournaments:
+        tournament.getGames()
+    finished = perf_counter()
+
+    return len(tournaments), sum(tournament.shape.groupGames[-1] for tournament in tournaments), enumerated - start, finished - enumerated
+
+def main():
+    print("{:>7} {:>6} {:>8} {:>11} {:>8} {:>13} {:>10}".format("groups", "teams", "pitches", "candidates", "games", "enumerate ms", "games ms"))
+
+    for (minGroupSize, maxGroupSize) in ((3, 5), (6, 8), (3, 8)):
+        for numOfTeams in (16, 64, 250, 500, 1000):
+            for numOfPitches in (1, 4, 10, 40):
+                (numOfCandidates, numOfGames, enumerateSeconds, gamesSeconds) = measure(numOfTeams, numOfPitches, minGroupSize, maxGroupSize)
+                print("{:>7} {:>6} {:>8} {:>11} {:>8} {:>13.2f} {:>10.1f}".format("{}-{}".format(minGroupSize, maxGroupSize), numOfTeams, numOfPitches, numOfCandidates, numOfGames, enumerateSeconds * 1000, gamesSeconds * 1000))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+# Compares calculating the games for every candidate in this process against spreading them across a process pool
+# The point where the pool becomes quicker is used to choose utils.parallel.PARALLEL_THRESHOLD
+# Run from the project root with: python3 -m benchmarks.parallel
+from os import cpu_count
+from time import perf_counter
+
+from utils import parallel
+from utils.organise import main as organise
+from utils.shapeCache import shapeCache
+
+# Returns the seconds taken to calculate the games for every candidate, and the total number of games
+def measure(teams, numOfPitches, workers):
+    shapeCache.clear()
+    tournaments = organise(teams, numOfPitches, 10, 5, 5, 9, 0, compact = True)
+    shapes = [tournament.shape for tournament in tournaments]
+
+    start = perf_counter()
+    parallel.calculateGames(shapes, workers = workers, threshold = 0)
+    return perf_counter() - start, sum(shape.groupGames[-1] for shape in shapes)
+
+def main():
+    workerCounts = [workers for workers in (2, 4, 8) if workers <= max(2, cpu_count())]
+
+    # The pools are started before timing so process start up is not counted
+    for workers in workerCounts:
+        measure(["Team {}".format(i) for i in range(100)], 4, workers)
+
+    print("{:>6} {:>8} {:>8} {:>10}".format("teams", "pitches", "games", "serial s") + "".join("{:>12}".format("{} workers s".format(workers)) for workers in workerCounts))
+
+    for numOfTeams in (50, 100, 200, 400, 600, 800, 1000):
+        teams = ["Team {}".format(i) for i in range(numOfTeams)]
+        (serial, numOfGames) = measure(teams, 8, 1)
+        times = [measure(teams, 8, workers)[0] for workers in workerCounts]
+        print("{:>6} {:>8} {:>8} {:>10.3f}".format(numOfTeams, 8, numOfGames, serial) + "".join("{:>12.3f}".format(seconds) for seconds in times))
+
+if __name__ == "__main__":
+    main()
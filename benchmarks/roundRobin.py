@@ -0,0 +1,53 @@
+# Compares the time taken to calculate the games on a pitch using TournamentPolygon and RoundRobin
+# Run from the project root with: python3 -m benchmarks.roundRobin
+from datetime import datetime, timedelta
+from timeit import timeit
+
+from utils.organise import Pitch, TournamentPolygon
+from utils.roundRobin import RoundRobin, calcPairings
+
+START_TIME = datetime(1970, 1, 1, 10, 0)
+GAME_DURATION = timedelta(minutes = 20)
+
+# Creates a pitch with a given number of teams
+def createPitch(numOfTeams, needsBye):
+    pitch = Pitch()
+    for i in range(numOfTeams):
+        pitch.addTeam("Team {}".format(i))
+    if needsBye == True:
+        pitch.needsBye()
+    return pitch
+
+# Returns the average time in microseconds taken to calculate the games on a pitch using the engine provided
+def timeEngine(engine, numOfTeams, needsBye, number):
+    seconds = timeit(lambda: engine(createPitch(numOfTeams, needsBye)).calculateGames(START_TIME, GAME_DURATION), number = number)
+    return seconds / number * 1000000
+
+# Returns the average time in microseconds taken to calculate only the pairings for a pitch, without creating any games
+def timePairings(numOfTeams, number):
+    polygon = timeit(lambda: TournamentPolygon(createPitch(numOfTeams, False)).getGames(), number = number)
+    roundRobin = timeit(lambda: calcPairings(numOfTeams), number = number)
+    return polygon / number * 1000000, roundRobin / number * 1000000
+
+def main():
+    print("Pairings only")
+    print("{:>6} {:>14} {:>14} {:>8}".format("teams", "polygon (us)", "array (us)", "speedup"))
+    for numOfTeams in (3, 4, 5, 8, 16, 32, 64, 128, 256):
+        number = max(20, 20000 // (numOfTeams * numOfTeams))
+        (polygon, roundRobin) = timePairings(numOfTeams, number)
+        print("{:>6} {:>14.1f} {:>14.1f} {:>7.2f}x".format(numOfTeams, polygon, roundRobin, polygon / roundRobin))
+
+    print()
+    print("Pairings and games")
+    print("{:>6} {:>5} {:>14} {:>14} {:>8}".format("teams", "bye", "polygon (us)", "array (us)", "speedup"))
+
+    # Groups in a normal tournament have 3-5 teams, but larger groups show how each engine scales
+    for numOfTeams in (3, 4, 5, 8, 16, 32, 64, 128, 256):
+        for needsBye in (False, True):
+            number = max(20, 20000 // (numOfTeams * numOfTeams))
+            polygon = timeEngine(TournamentPolygon, numOfTeams, needsBye, number)
+            roundRobin = timeEngine(RoundRobin, numOfTeams, needsBye, number)
+            print("{:>6} {:>5} {:>14.1f} {:>14.1f} {:>7.2f}x".format(numOfTeams, str(needsBye), polygon, roundRobin, polygon / roundRobin))
+
+if __name__ == "__main__":
+    main()
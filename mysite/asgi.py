@@ -0,0 +1,43 @@
+# ASGI entry point for the project, used to serve it with an ASGI server
+# Run with: uvicorn mysite.asgi:application
+import os
+
+from django.core.asgi import get_asgi_application
+from django.core.wsgi import get_wsgi_application
+
+# WsgiToAsgi runs a WSGI application in a thread, so it can be served alongside the ASGI application
+from asgiref.wsgi import WsgiToAsgi
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mysite.settings")
+
+# Handles every request other than the score feed, running each view in a thread
+djangoApplication = get_asgi_application()
+
+# Handles the streamed exports
+# Django's ASGI handler reads streamed responses in the event loop, where their database queries are not allowed, so they are read in a thread instead
+streamingApplication = WsgiToAsgi(get_wsgi_application())
+
+# Imported once Django has been set up, as they use the URLs and database tables of the project
+from django.urls import resolve, Resolver404
+from tournament.feed import scoreFeedApplication
+
+# The views whose responses are streamed a chunk of games at a time
+STREAMING_VIEWS = ["tournament:exportAsCSV", "tournament:exportAsJSON", "tournament:exportAsCalendar"]
+
+# Sends the score feed to scoreFeedApplication, so clients waiting for new scores do not hold a thread, the streamed exports to streamingApplication and everything else to Django
+async def application(scope, receive, send):
+    if scope["type"] == "http":
+        try:
+            match = resolve(scope["path"])
+        except Resolver404:
+            match = None
+
+        if match is not None and match.view_name == "tournament:scoreFeed":
+            await scoreFeedApplication(scope, receive, send, match.kwargs["pk"])
+            return
+
+        if match is not None and match.view_name in STREAMING_VIEWS:
+            await streamingApplication(scope, receive, send)
+            return
+
+    await djangoApplication(scope, receive, send)
@@ -94,3 +94,14 @@ AUTHENTICATION_BACKENDS = ['account.models.MyBackend']
 
 # The model used for users
 AUTH_USER_MODEL = "account.User"
+
+# Cache used to store the tournament options shown to organisers
+# Each process has its own cache, so if an option is not found it is worked out again
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# The most seconds spent searching for tournament options before showing the best found so far
+ORGANISE_TIME_BUDGET = 2
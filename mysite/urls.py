@@ -1,6 +1,9 @@
 from django.contrib import admin
 from django.urls import path, include
 
+# Serves the static files while DEBUG is on, as runserver does, so they are also served through ASGI
+from django.contrib.staticfiles.urls import staticfiles_urlpatterns
+
 from . import views
 
 # Runs appropriate subroutine depending on URL path
@@ -11,3 +14,5 @@ urlpatterns = [
     path("team/", include("team.urls")),
     path("admin/", admin.site.urls),
 ]
+
+urlpatterns += staticfiles_urlpatterns()
@@ -0,0 +1,8 @@
+# WSGI entry point for the project, used to serve it with a WSGI server
+import os
+
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mysite.settings")
+
+application = get_wsgi_application()
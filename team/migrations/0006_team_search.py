@@ -0,0 +1,50 @@
+from django.db import migrations
+
+
+# Creates a full text index of team names, kept up to date by triggers on the team table
+# Full text indexes are specific to SQLite, so on other databases team searches do not use an index
+def createSearchTable(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    schema_editor.execute("CREATE VIRTUAL TABLE team_team_fts USING fts5(name, content = 'team_team', content_rowid = 'id')")
+    schema_editor.execute("""
+        CREATE TRIGGER team_team_fts_insert AFTER INSERT ON team_team BEGIN
+            INSERT INTO team_team_fts(rowid, name) VALUES (new.id, new.name);
+        END
+    """)
+    schema_editor.execute("""
+        CREATE TRIGGER team_team_fts_delete AFTER DELETE ON team_team BEGIN
+            INSERT INTO team_team_fts(team_team_fts, rowid, name) VALUES ('delete', old.id, old.name);
+        END
+    """)
+    schema_editor.execute("""
+        CREATE TRIGGER team_team_fts_update AFTER UPDATE ON team_team BEGIN
+            INSERT INTO team_team_fts(team_team_fts, rowid, name) VALUES ('delete', old.id, old.name);
+            INSERT INTO team_team_fts(rowid, name) VALUES (new.id, new.name);
+        END
+    """)
+
+    # Every team already in the database is added to the index
+    schema_editor.execute("INSERT INTO team_team_fts(team_team_fts) VALUES ('rebuild')")
+
+
+# Removes the full text index of team names
+def removeSearchTable(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    for trigger in ("insert", "delete", "update"):
+        schema_editor.execute("DROP TRIGGER IF EXISTS team_team_fts_{}".format(trigger))
+    schema_editor.execute("DROP TABLE IF EXISTS team_team_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0005_auto_20190408_1629'),
+    ]
+
+    operations = [
+        migrations.RunPython(createSearchTable, removeSearchTable),
+    ]
@@ -0,0 +1,55 @@
+# connection tells the search which database is being used
+from django.db import connection
+
+# Q allows teams matching any word of the search to be found in one query
+# RawSQL allows the full text index to be used alongside the team table
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+# Imports database tables
+from . import models
+
+# Words which are removed from searches as too many teams will match them
+STOP_WORDS = ["rfc", "rugby", "club", "team"]
+
+# The full text index of team names, which is only created on SQLite databases
+SEARCH_TABLE = "team_team_fts"
+
+# Returns the words in a search, without the words too many teams will match
+def splitQuery(query):
+    return [word for word in query.split() if word.lower() not in STOP_WORDS]
+
+# Returns the full text query matching any team name with a word starting with any of the words given
+# Each word is quoted so characters in it are not treated as part of the query syntax
+def createMatch(words):
+    return " OR ".join('"{}"*'.format(word.replace('"', '""')) for word in words)
+
+# Returns the teams matching a search, best match first, in a single query
+# excluded holds querysets of the ids of teams which should not be included, such as teams the user is already a member of
+# On SQLite the full text index is used, which matches the start of each word and ranks teams matching more of the words higher
+# On other databases any team with a name containing one of the words is matched, in alphabetical order
+def searchTeams(query, *excluded):
+    words = splitQuery(query)
+
+    # If every word was removed there is nothing to search for
+    if len(words) == 0:
+        return []
+
+    if connection.vendor == "sqlite":
+        match = createMatch(words)
+        teams = models.Team.objects.filter(
+            id__in = RawSQL("SELECT rowid FROM {0} WHERE {0} MATCH %s".format(SEARCH_TABLE), (match,))
+        ).annotate(
+            rank = RawSQL("SELECT rank FROM {0} WHERE {0} MATCH %s AND rowid = team_team.id".format(SEARCH_TABLE), (match,))
+        ).order_by("rank", "name")
+    else:
+        matches = Q()
+        for word in words:
+            matches |= Q(name__icontains = word)
+        teams = models.Team.objects.filter(matches).order_by("name")
+
+    # Teams which should not be included are removed by the database
+    for teamIds in excluded:
+        teams = teams.exclude(id__in = teamIds)
+
+    return list(teams)
@@ -0,0 +1,60 @@
+from django.test import TestCase
+
+from . import models, search, views
+from tournament import models as tournamentModels
+from tournament.tests import createTournament
+
+class RecordTestCase(TestCase):
+    def setUp(self):
+        self.tournament = createTournament(pitches = 1)
+        timeslot = tournamentModels.Timeslot.objects.create(number = 1, tournament = self.tournament)
+        self.pitch = tournamentModels.PitchInstance.objects.create(name = "1", timeslot = timeslot)
+        self.team = models.Team.objects.create(name = "Test Team")
+        self.otherTeam = models.Team.objects.create(name = "Other Team")
+
+    # Adds a game between two teams to the database
+    def addGame(self, team1, team2, team1Score, team2Score):
+        tournamentModels.Game.objects.create(team1 = team1, team2 = team2, team1Score = team1Score, team2Score = team2Score, startTime = "10:30", pitch = self.pitch, tournament = self.tournament)
+
+    def test_record_counts_each_side_of_a_game(self):
+        # Won as team1 and as team2, drawn, lost as team2, and a game with no result yet
+        self.addGame(self.team, self.otherTeam, 3, 1)
+        self.addGame(self.otherTeam, self.team, 0, 2)
+        self.addGame(self.team, self.otherTeam, 2, 2)
+        self.addGame(self.otherTeam, self.team, 5, 1)
+        self.addGame(self.team, self.otherTeam, None, None)
+
+        with self.assertNumQueries(1):
+            record = views.calcRecord(self.team)
+
+        self.assertEqual(record, {"played": 4, "won": 2, "drawn": 1, "lost": 1})
+        self.assertEqual(views.calcRecord(self.otherTeam), {"played": 4, "won": 1, "drawn": 1, "lost": 2})
+
+class SearchTestCase(TestCase):
+    def setUp(self):
+        self.oxford = models.Team.objects.create(name = "Oxford RFC")
+        self.oxfordUniversity = models.Team.objects.create(name = "Oxford University RFC")
+        self.oxbridge = models.Team.objects.create(name = "Oxbridge Rugby Club")
+        self.cambridge = models.Team.objects.create(name = "Cambridge RFC")
+
+    def test_teams_are_matched_by_prefix_and_ranked(self):
+        with self.assertNumQueries(1):
+            matches = search.searchTeams("Ox")
+        self.assertEqual(set(matches), {self.oxford, self.oxfordUniversity, self.oxbridge})
+
+        # The team matching more of the words is first
+        self.assertEqual(search.searchTeams("Oxford Univ")[0], self.oxfordUniversity)
+
+        # Words too many teams match are ignored
+        self.assertEqual(search.searchTeams("RFC"), [])
+
+    def test_excluded_teams_are_removed(self):
+        excluded = models.Team.objects.filter(name__startswith = "Oxford").values("id")
+        self.assertEqual(search.searchTeams("Ox", excluded), [self.oxbridge])
+
+    def test_index_follows_changes_to_teams(self):
+        self.cambridge.name = "Oxenford RFC"
+        self.cambridge.save()
+        self.oxbridge.delete()
+
+        self.assertEqual(set(search.searchTeams("Ox")), {self.oxford, self.oxfordUniversity, self.cambridge})
@@ -8,9 +8,15 @@ from django.http import HttpResponseRedirect
 # reverse returns a URL path depending on its parameters
 from django.urls import reverse
 
+# Q and F allow the database to compare scores, and Count counts the games matching each comparison
+from django.db.models import Count, F, Q
+
 # Imports forms and database tables
 from . import models, forms
 
+# Searches for teams using the full text index of team names
+from .search import searchTeams
+
 # Imports database tables defined in tournament app
 from tournament import models as tournamentModels
 
@@ -29,48 +35,36 @@ def team(request, pk):
         # Holds whether the user is a team administrator
         isTeamAdministrator = membership.administrator
 
-        # Every game the team has partaken in
-        allGames = tournamentModels.Game.objects.none()
-        allGames = allGames | tournamentModels.Game.objects.filter(team1 = teamSelected)
-        allGames = allGames | tournamentModels.Game.objects.filter(team2 = teamSelected)
-
-        # Won, drawn and lost is initially set to 0
-        won = 0
-        drawn = 0
-        lost = 0
-
-        # For each game the team has played
-        for game in allGames:
-            # If game was a draw
-            if game.team1Score == game.team2Score:
-                drawn += 1
-            # If team is team1
-            elif game.team1 == teamSelected:
-                # If team1 won
-                if game.team1Score > game.team2Score:
-                    won += 1
-                #If team1 lost
-                else:
-                    lost += 1
-            # Must be team 2
-            else:
-                # If team2 won
-                if game.team2Score > game.team1Score:
-                    won += 1
-                # If team2 lost
-                else:
-                    lost += 1
+        # The number of games the team has played, won, drawn and lost
+        record = calcRecord(teamSelected)
 
         # Returns the HTML page with team information
         return render(request, "team/team.html", {
             "team": teamSelected,
             "isTeamAdministrator": isTeamAdministrator,
-            "games": allGames,
-            "won": won,
-            "drawn": drawn,
-            "lost": lost
+            "played": record["played"],
+            "won": record["won"],
+            "drawn": record["drawn"],
+            "lost": record["lost"]
         })
 
+# Returns the number of games a team has played, won, drawn and lost, worked out by the database in a single query
+# Games which do not have a result yet are not included
+def calcRecord(teamSelected):
+    # Every game the team has played which has a result
+    games = tournamentModels.Game.objects.filter(Q(team1 = teamSelected) | Q(team2 = teamSelected)).exclude(team1Score = None).exclude(team2Score = None)
+
+    # The team won if it scored more than the other team, whichever side of the game it was on
+    won = Q(team1 = teamSelected, team1Score__gt = F("team2Score")) | Q(team2 = teamSelected, team2Score__gt = F("team1Score"))
+    lost = Q(team1 = teamSelected, team1Score__lt = F("team2Score")) | Q(team2 = teamSelected, team2Score__lt = F("team1Score"))
+
+    return games.aggregate(
+        played = Count("id"),
+        won = Count("id", filter = won),
+        drawn = Count("id", filter = Q(team1Score = F("team2Score"))),
+        lost = Count("id", filter = lost)
+    )
+
 # Provides the user with the list of teams they are a member of
 def teamList(request):
     return render(request, "team/teamList.html")
@@ -124,21 +118,13 @@ def requestTeam(request):
             # The user making the search
             user = models.User.objects.get(id = request.user.id)
 
-            # The team being searched for is split into individual words
-            team = form.cleaned_data.get("team")
-            teamSplit = team.split(" ")
-
-            # The words "Rugby", "RFC", "Club" and "Team" are removed as too many teams will match this
-            teamSplitFiltered = [i for i in teamSplit if i != "RFC" and i != "Rugby" and i != "Club" and i != "Team"]
-
-            # For each word that makes up the search
-            for keyWord in teamSplitFiltered:
-                # All matches that contain this word
-                matches = models.Team.objects.filter(name__icontains = keyWord)
-                # Each match is added to the search results providing the user it not already a member of the team and is not already requesting to join that team
-                for match in matches:
-                    if match not in allMatches and match not in user.getTeams() and match not in user.getRequests():
-                        allMatches.append(match)
+            # The teams matching the search, best match first
+            # Teams the user is already a member of or is already requesting to join are not included
+            allMatches = searchTeams(
+                form.cleaned_data.get("team"),
+                models.Membership.objects.filter(user = user).values("team"),
+                models.Request.objects.filter(user = user).values("team")
+            )
 
             # The webpage will now display these search results
             searched = True
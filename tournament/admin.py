@@ -10,3 +10,5 @@ admin.site.register(models.Timeslot)
 admin.site.register(models.PitchInstance)
 admin.site.register(models.Game)
 admin.site.register(models.Invite)
+admin.site.register(models.Standing)
+admin.site.register(models.PDFExport)
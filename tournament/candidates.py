@@ -0,0 +1,59 @@
+# cache stores the tournament options shown to an organiser, so the option they choose is exactly the one they saw
+from django.core.cache import cache
+
+# hashlib turns the tournament settings and enrolled teams into a short version string
+import hashlib
+
+# How long the options shown to an organiser are kept for in seconds
+OPTIONS_TIMEOUT = 60 * 60
+
+# Returns a version string for a tournament, which changes whenever its settings or the teams enrolled in it change
+# The teams are included in order, as the order of the teams decides which teams play on each pitch
+def calcVersion(tournament, teams):
+    settings = [
+        tournament.pitches,
+        tournament.halfDuration,
+        tournament.halfTimeDuration,
+        tournament.swapTeamsDuration,
+        tournament.startTime.strftime("%H:%M"),
+        tournament.minGroupSize,
+        tournament.maxGroupSize,
+        [team.pk for team in teams]
+    ]
+    return hashlib.sha1(repr(settings).encode()).hexdigest()
+
+# Returns the cache key for the options of a tournament with the settings and teams given
+# Options for old settings or teams are never looked up again, so they are left to expire
+def getCacheKey(tournament, teams):
+    return "tournament:{}:options:{}".format(tournament.pk, calcVersion(tournament, teams))
+
+# Stores the options shown for a tournament, keyed by the number used to choose each option
+def cacheOptions(tournament, teams, options):
+    cache.set(getCacheKey(tournament, teams), {option.getNumber(): option for option in options}, OPTIONS_TIMEOUT)
+
+# Returns the option numbered num last shown for a tournament, or None if it is not stored for its current settings and teams
+def getCachedOption(tournament, teams, num):
+    options = cache.get(getCacheKey(tournament, teams))
+    if options is None:
+        return None
+    return options.get(num)
+
+# Returns the cache key for the rendered list of options of a tournament with the settings and teams given
+# The team names are shown in the list, and organisers are shown a button to choose each option, so both are part of the key
+def getFragmentKey(tournament, teams, userIsOrganiser):
+    names = hashlib.sha1(repr([team.name for team in teams]).encode()).hexdigest()
+    return "tournament:{}:fragment:{}:{}:{}".format(tournament.pk, userIsOrganiser, calcVersion(tournament, teams), names)
+
+# Returns the rendered list of options last shown for a tournament, or None if it is not stored for its current settings and teams
+# The list is only used if the options in it are still stored, so the option chosen is always the option shown
+# Both are looked up in a single cache read
+def getCachedFragment(tournament, teams, userIsOrganiser):
+    fragmentKey = getFragmentKey(tournament, teams, userIsOrganiser)
+    cached = cache.get_many([fragmentKey, getCacheKey(tournament, teams)])
+    if len(cached) != 2:
+        return None
+    return cached[fragmentKey]
+
+# Stores the rendered list of options for a tournament, which should be done after the options themselves are stored
+def cacheFragment(tournament, teams, userIsOrganiser, fragment):
+    cache.set(getFragmentKey(tournament, teams, userIsOrganiser), fragment, OPTIONS_TIMEOUT)
@@ -0,0 +1,28 @@
+# get_conditional_response returns a 304 response if the browser already has the latest copy of a page
+# quote_etag and http_date format the ETag and Last-Modified headers
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag, http_date
+
+# Returns the ETag and Last-Modified time of a page showing the schedule of a tournament
+# extra holds anything else the page depends on, such as the user viewing it
+# A page which is different for each user has no Last-Modified time, as a browser could otherwise be given a copy made for someone else just because it is recent enough
+def getValidators(tournamentSelected, *extra, perUser = False):
+    parts = [tournamentSelected.pk, tournamentSelected.scheduleVersion] + list(extra)
+    etag = quote_etag("-".join(str(part) for part in parts))
+    if perUser == True:
+        return (etag, None)
+    return (etag, int(tournamentSelected.scheduleUpdated.timestamp()))
+
+# Returns a 304 response if the browser already has the copy of a page with the validators given, otherwise returns None
+# If the page has no Last-Modified time only its ETag is checked
+def getNotModified(request, validators):
+    (etag, lastModified) = validators
+    return get_conditional_response(request, etag = etag, last_modified = lastModified)
+
+# Adds the ETag and Last-Modified headers to a response, so the browser can ask whether its copy is up to date next time
+def setValidators(response, validators):
+    (etag, lastModified) = validators
+    response["ETag"] = etag
+    if lastModified is not None:
+        response["Last-Modified"] = http_date(lastModified)
+    return response
@@ -0,0 +1,101 @@
+# timezone gives the times a PDF was started and finished
+# timedelta gives how long a worker has to make a PDF before it is made again
+from django.utils import timezone
+from datetime import timedelta
+
+# hashlib turns the schedule of a tournament into a short version string
+import hashlib
+
+# logging records PDFs which could not be made
+import logging
+
+# Turns HTML into a PDF for a tournament
+from utils.renderToPDF import renderToPDF
+
+# Loads a tournament layout from the database
+from .schedule import loadSchedule
+
+# Imports database tables
+from . import models
+
+logger = logging.getLogger(__name__)
+
+# The most seconds a worker can take to make a PDF before it is assumed to have stopped, and the PDF is added back to the queue
+JOB_TIMEOUT = 5 * 60
+
+# Returns a version string for the schedule of a tournament, which changes whenever anything shown in its PDF changes
+# This is worked out from a single query of the games, so it is much quicker than making the PDF
+def calcScheduleVersion(tournamentSelected):
+    games = models.Game.objects.filter(tournament = tournamentSelected).order_by("id").values_list(
+        "id", "pitch__timeslot__number", "pitch__name", "startTime", "team1__name", "team2__name"
+    )
+    schedule = [tournamentSelected.name, [(game[0], game[1], game[2], game[3].strftime("%H:%M"), game[4], game[5]) for game in games]]
+    return hashlib.sha1(repr(schedule).encode()).hexdigest()
+
+# Returns the PDF export for the current schedule of a tournament, adding it to the queue if it has not been asked for before
+# A PDF which failed to be made is added back to the queue, so it is tried again
+def requestPDF(tournamentSelected):
+    export, created = models.PDFExport.objects.get_or_create(
+        tournament = tournamentSelected,
+        version = calcScheduleVersion(tournamentSelected)
+    )
+
+    if export.status == models.PDFExport.FAILED:
+        models.PDFExport.objects.filter(pk = export.pk, status = models.PDFExport.FAILED).update(status = models.PDFExport.PENDING)
+        export.status = models.PDFExport.PENDING
+    elif export.status == models.PDFExport.RUNNING and requeueStaleJobs(models.PDFExport.objects.filter(pk = export.pk)) == 1:
+        export.status = models.PDFExport.PENDING
+
+    return export
+
+# Adds PDFs whose worker started making them too long ago back to the queue, as the worker must have stopped part way through
+# Returns how many PDFs were added back
+def requeueStaleJobs(exports = None):
+    if exports is None:
+        exports = models.PDFExport.objects.all()
+    cutoff = timezone.now() - timedelta(seconds = JOB_TIMEOUT)
+    return exports.filter(status = models.PDFExport.RUNNING, started__lt = cutoff).update(status = models.PDFExport.PENDING)
+
+# Takes the oldest PDF export in the queue and marks it as running, or returns None if the queue is empty
+# The export is only marked as running if it is still pending, so two workers never make the same PDF
+def claimNextJob():
+    requeueStaleJobs()
+
+    while True:
+        export = models.PDFExport.objects.filter(status = models.PDFExport.PENDING).order_by("created", "id").first()
+        if export is None:
+            return None
+
+        started = timezone.now()
+        if models.PDFExport.objects.filter(pk = export.pk, status = models.PDFExport.PENDING).update(status = models.PDFExport.RUNNING, started = started) == 1:
+            export.status = models.PDFExport.RUNNING
+            export.started = started
+            return export
+
+# Makes the PDF for an export and stores it in the database
+# PDFs for older versions of the tournament's schedule are removed, as they will never be asked for again
+def processJob(export):
+    try:
+        tournamentSelected = export.tournament
+        export.pdf = renderToPDF(tournamentSelected, loadSchedule(tournamentSelected))
+        export.status = models.PDFExport.DONE
+    except Exception:
+        logger.exception("Could not make the PDF for tournament %s", export.tournament_id)
+        export.status = models.PDFExport.FAILED
+
+    # The export is updated rather than saved, so nothing goes wrong if the tournament was deleted while its PDF was being made
+    export.finished = timezone.now()
+    models.PDFExport.objects.filter(pk = export.pk).update(pdf = export.pdf, status = export.status, finished = export.finished)
+
+    if export.status == models.PDFExport.DONE:
+        models.PDFExport.objects.filter(tournament_id = export.tournament_id, created__lt = export.created).exclude(pk = export.pk).delete()
+
+# Makes every PDF in the queue, returning how many were made
+def processPendingJobs():
+    processed = 0
+    export = claimNextJob()
+    while export is not None:
+        processJob(export)
+        processed += 1
+        export = claimNextJob()
+    return processed
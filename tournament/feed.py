@@ -0,0 +1,126 @@
+# sleep waits between checks of whether a tournament's scores have changed
+# monotonic measures how long a client has been waiting for
+from time import sleep, monotonic
+
+# asyncio waits between checks without holding a thread, so a single process can keep many clients waiting when served through ASGI
+# json writes the scores sent through ASGI
+import asyncio
+import json
+
+# sync_to_async runs database queries from the ASGI score feed in a thread
+# request_started and request_finished let Django tidy up its database connections around each ASGI score feed request
+from asgiref.sync import sync_to_async
+from django.core.signals import request_started, request_finished
+
+# QueryDict reads the query string of an ASGI score feed request in the same way as request.GET
+# DjangoJSONEncoder writes JSON in the same way as JsonResponse
+from django.http import QueryDict
+from django.core.serializers.json import DjangoJSONEncoder
+
+# Returns the games of a tournament ready to be sent to clients
+from .fixtures import FIXTURE_FIELDS, iterFixtures, formatFixture
+
+# Imports database tables
+from . import models
+
+# The most seconds a client waits for new scores before being told there are none, when the site is served through ASGI
+LONG_POLL_TIMEOUT = 25
+
+# The most seconds a client waits for new scores when the feed is answered by the scoreFeed view, such as under runserver or WSGI
+# Each waiting client holds a whole thread there, so by default clients are answered straight away and only wait if they ask to
+SYNC_POLL_TIMEOUT = 5
+
+# The seconds between checks of whether a tournament's scores have changed while a client waits
+POLL_INTERVAL = 1
+
+# Returns the version a client last saw, which is not given the first time a client asks, and how long it is willing to wait for new scores
+# query holds the query string of the request
+# If the client does not say how long it will wait, it waits for defaultTimeout seconds, and it never waits for more than maxTimeout seconds
+# Raises a ValueError if either is not a number
+def parseFeedQuery(query, defaultTimeout, maxTimeout):
+    since = query.get("since")
+    since = int(since) if since else None
+    timeout = min(max(float(query.get("timeout", defaultTimeout)), 0), maxTimeout)
+    return (since, timeout)
+
+# Returns the current schedule version of a tournament, reading only that field from the database
+def getScheduleVersion(tournamentSelected):
+    return models.Tournament.objects.filter(pk = tournamentSelected.pk).values_list("scheduleVersion", flat = True).get()
+
+# Returns whether the schedule version of a tournament is later than since, loading its latest versions if it is
+def checkForChange(tournamentSelected, since):
+    if getScheduleVersion(tournamentSelected) > since:
+        tournamentSelected.refresh_from_db(fields = ["scheduleVersion", "layoutVersion"])
+        return True
+    return False
+
+# Waits until the schedule version of a tournament is later than since, or until timeout seconds have passed
+# Returns the tournament with its latest versions
+def waitForChange(tournamentSelected, since, timeout):
+    deadline = monotonic() + timeout
+    while tournamentSelected.scheduleVersion <= since and monotonic() < deadline:
+        sleep(min(POLL_INTERVAL, max(deadline - monotonic(), 0)))
+        checkForChange(tournamentSelected, since)
+    return tournamentSelected
+
+# Returns the games of a tournament whose scores have changed since the schedule version a client last saw
+# If the client has not seen the current layout, every game is returned and reset tells the client to forget the games it has
+# The client sends the version returned next time, so it is only sent the games which have changed since
+def getScoreFeed(tournamentSelected, since = None):
+    reset = since is None or since < tournamentSelected.layoutVersion
+    games = iterFixtures(tournamentSelected, since = None if reset == True else since)
+
+    return {
+        "version": tournamentSelected.scheduleVersion,
+        "reset": reset,
+        "games": [dict(zip(FIXTURE_FIELDS, formatFixture(game))) for game in games]
+    }
+
+# The same as waitForChange, but the client waits without holding a thread, so many clients can wait at once
+# Only the check of the schedule version uses a thread, for the moment it takes to run the query
+async def waitForChangeAsync(tournamentSelected, since, timeout):
+    deadline = monotonic() + timeout
+    while tournamentSelected.scheduleVersion <= since and monotonic() < deadline:
+        await asyncio.sleep(min(POLL_INTERVAL, max(deadline - monotonic(), 0)))
+        await sync_to_async(checkForChange)(tournamentSelected, since)
+    return tournamentSelected
+
+# Sends a JSON response to an ASGI client
+async def sendJSON(send, status, content):
+    body = json.dumps(content, cls = DjangoJSONEncoder).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    })
+    await send({"type": "http.response.body", "body": body})
+
+# Answers the score feed of the tournament with primary key pk when the site is served through ASGI
+# It gives the same responses as the scoreFeed view, but clients waiting for new scores do not hold a thread while they wait
+async def scoreFeedApplication(scope, receive, send, pk):
+    await sync_to_async(request_started.send)(sender = scoreFeedApplication, scope = scope)
+    try:
+        # The feed can only be read
+        if scope["method"] not in ("GET", "HEAD"):
+            await sendJSON(send, 405, {"error": "Method not allowed"})
+            return
+
+        try:
+            (since, timeout) = parseFeedQuery(QueryDict(scope["query_string"].decode()), LONG_POLL_TIMEOUT, LONG_POLL_TIMEOUT)
+        # If the version or timeout are not numbers
+        except ValueError:
+            await sendJSON(send, 404, {"error": "Not found"})
+            return
+
+        tournamentSelected = await sync_to_async(models.Tournament.objects.filter(pk = pk).first)()
+        if tournamentSelected is None:
+            await sendJSON(send, 404, {"error": "Not found"})
+            return
+
+        # If the client already has the latest scores it waits for new ones
+        if since is not None and since >= tournamentSelected.scheduleVersion:
+            await waitForChangeAsync(tournamentSelected, since, timeout)
+
+        await sendJSON(send, 200, await sync_to_async(getScoreFeed)(tournamentSelected, since))
+    finally:
+        await sync_to_async(request_finished.send)(sender = scoreFeedApplication)
@@ -0,0 +1,119 @@
+# csv writes fixtures as comma separated values
+# json writes fixtures as JSON
+import csv
+import json
+
+# datetime and timedelta work out when each game starts and ends for calendars
+# timezone gives the time a calendar was made
+from datetime import datetime, timedelta
+from django.utils import timezone
+
+# Q allows the games of a team to be found whether it is the first or second team
+from django.db.models import Q
+
+# Imports database tables
+from . import models
+
+# The number of games fetched from the database at a time, so the memory used does not grow with the size of the tournament
+CHUNK_SIZE = 500
+
+# The fields of each game in the CSV and JSON exports, in order
+FIXTURE_FIELDS = ["id", "timeslot", "pitch", "startTime", "team1", "team2", "team1Score", "team2Score"]
+
+# Returns the games in a tournament in the order they are played, a chunk at a time from the database
+# Each game is a tuple of the values of FIXTURE_FIELDS, with the start time as a time
+# If a team is given only its games are returned, without any games against the bye team
+# If since is given only the games whose scores have changed after that schedule version are returned
+def iterFixtures(tournamentSelected, team = None, since = None):
+    games = models.Game.objects.filter(tournament = tournamentSelected)
+    if team is not None:
+        games = games.filter(Q(team1 = team) | Q(team2 = team)).exclude(team1_id = models.BYE_TEAM_ID).exclude(team2_id = models.BYE_TEAM_ID)
+    if since is not None:
+        games = games.filter(scoreVersion__gt = since)
+
+    games = games.order_by("startTime", "pitch__timeslot__number", "id").values_list(
+        "id", "pitch__timeslot__number", "pitch__name", "startTime", "team1__name", "team2__name", "team1Score", "team2Score"
+    )
+
+    return games.iterator(chunk_size = CHUNK_SIZE)
+
+# Returns a game with its start time written as hours and minutes, ready to be exported
+def formatFixture(game):
+    return game[:3] + (game[3].strftime("%H:%M"),) + game[4:]
+
+# A file-like object which returns what is written to it, so each row of the CSV can be sent as soon as it is written
+class Echo:
+    def write(self, value):
+        return value
+
+# Yields the fixtures of a tournament as CSV, one line at a time
+def streamCSV(tournamentSelected):
+    writer = csv.writer(Echo())
+    yield writer.writerow(FIXTURE_FIELDS)
+    for game in iterFixtures(tournamentSelected):
+        yield writer.writerow(formatFixture(game))
+
+# Yields the fixtures of a tournament as a JSON object, one game at a time
+def streamJSON(tournamentSelected):
+    yield '{{"tournament": {}, "games": ['.format(json.dumps({
+        "id": tournamentSelected.pk,
+        "name": tournamentSelected.name,
+        "location": tournamentSelected.location,
+        "startDate": tournamentSelected.startDate.isoformat()
+    }))
+
+    separator = ""
+    for game in iterFixtures(tournamentSelected):
+        yield separator + json.dumps(dict(zip(FIXTURE_FIELDS, formatFixture(game))))
+        separator = ", "
+
+    yield "]}"
+
+# Returns text with the characters which have a meaning in an iCalendar file escaped
+def escapeText(text):
+    return str(text).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+# The most octets an iCalendar line can have, not counting the line break
+MAX_LINE_OCTETS = 75
+
+# Returns a line of an iCalendar file ending with a line break, folded onto more lines if it is too long
+# Each extra line starts with a space, which is counted as part of it, and characters are never split across lines
+def foldLine(line):
+    lines = []
+    current = ""
+    size = 0
+    for character in line:
+        octets = len(character.encode())
+        if size + octets > MAX_LINE_OCTETS:
+            lines.append(current)
+            current = " "
+            size = 1
+        current += character
+        size += octets
+    lines.append(current)
+    return "\r\n".join(lines) + "\r\n"
+
+# Yields the games of a team in a tournament as an iCalendar file, one line at a time
+# The times are local to the tournament, so they are written without a time zone
+def streamCalendar(tournamentSelected, team):
+    # How long each game lasts, from kick off to the final whistle
+    gameDuration = timedelta(minutes = tournamentSelected.halfDuration * 2 + tournamentSelected.halfTimeDuration)
+    stamp = timezone.now().strftime("%Y%m%dT%H%M%SZ")
+
+    yield foldLine("BEGIN:VCALENDAR")
+    yield foldLine("VERSION:2.0")
+    yield foldLine("PRODID:-//Rugby Tournament System//Fixtures//EN")
+    yield foldLine("X-WR-CALNAME:{}".format(escapeText("{} - {}".format(tournamentSelected.name, team.name))))
+
+    for (gameId, timeslot, pitch, startTime, team1, team2, team1Score, team2Score) in iterFixtures(tournamentSelected, team):
+        start = datetime.combine(tournamentSelected.startDate, startTime)
+        yield foldLine("BEGIN:VEVENT")
+        yield foldLine("UID:tournament-{}-game-{}".format(tournamentSelected.pk, gameId))
+        yield foldLine("DTSTAMP:{}".format(stamp))
+        yield foldLine("DTSTART:{}".format(start.strftime("%Y%m%dT%H%M%S")))
+        yield foldLine("DTEND:{}".format((start + gameDuration).strftime("%Y%m%dT%H%M%S")))
+        yield foldLine("SUMMARY:{}".format(escapeText("{} vs {}".format(team1, team2))))
+        yield foldLine("LOCATION:{}".format(escapeText("{}, Pitch {}".format(tournamentSelected.location, pitch))))
+        yield foldLine("END:VEVENT")
+
+    yield foldLine("END:VCALENDAR")
@@ -18,9 +18,12 @@ class TournamentForm(forms.ModelForm):
             "halfTimeDuration": "Duration of Half-Time",
             "swapTeamsDuration": "Duration Between Games",
             "startDate": "Date",
-            "startTime": "Start Time"
+            "startTime": "Start Time",
+            "minGroupSize": "Minimum Teams in a Group",
+            "maxGroupSize": "Maximum Teams in a Group"
         }
-        exclude = []
+        # The versions of the schedule are only changed by the site, as browsers and clients following the scores use them to tell whether their copy is up to date
+        exclude = ["scheduleVersion", "scheduleUpdated", "layoutVersion"]
 
         widgets = {
             # Start date uses a date selection dropdown
@@ -49,6 +52,18 @@ class TournamentForm(forms.ModelForm):
         if data.get("swapTeamsDuration") < 0:
             errors.update({"swapTeamsDuration": "You cannot have a negative duration between games."})
 
+        # The group sizes are only compared if they were both entered, otherwise the form already has an error for the missing field
+        minGroupSize = data.get("minGroupSize")
+        maxGroupSize = data.get("maxGroupSize")
+
+        # If the user has stated that a group can have fewer than three teams raise an error
+        if minGroupSize is not None and minGroupSize < 3:
+            errors.update({"minGroupSize": "A group must have at least 3 teams."})
+
+        # If the user has stated that the largest group is smaller than the smallest group raise an error
+        if minGroupSize is not None and maxGroupSize is not None and maxGroupSize < minGroupSize:
+            errors.update({"maxGroupSize": "The maximum number of teams in a group cannot be less than the minimum."})
+
         # If there are errors
         if errors != {}:
             raise forms.ValidationError(errors)
@@ -68,7 +83,7 @@ class GameForm(forms.ModelForm):
             "team2Score": ""
         }
         # Only fields in the form are team1Score and team2Score
-        exclude = ["team1", "team2", "startTime", "pitch"]
+        exclude = ["team1", "team2", "startTime", "pitch", "tournament", "scoreVersion"]
 
     # Determines whether the form is valid
     def clean(self):
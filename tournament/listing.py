@@ -0,0 +1,34 @@
+# Q allows a page to start after a tournament, whether it is on an earlier date or on the same date with a lower id
+from django.db.models import Q
+
+# datetime allows the date a page starts after to be read from the URL
+from datetime import datetime
+
+# The number of tournaments shown in each list on one page
+PAGE_SIZE = 20
+
+# Returns the cursor for a tournament, which is its start date and id, used to start the next page after it
+def formatCursor(tournament):
+    return "{}.{}".format(tournament.startDate.strftime("%Y-%m-%d"), tournament.id)
+
+# Returns the start date and id held in a cursor, raising ValueError if the cursor is not valid
+def parseCursor(cursor):
+    (startDate, id) = cursor.split(".")
+    return datetime.strptime(startDate, "%Y-%m-%d").date(), int(id)
+
+# Returns one page of tournaments ordered most recent first, and the cursor for the next page or None if this is the last page
+# Rather than skipping an offset, the page starts straight after the tournament in the cursor, so later pages are as fast as the first
+def getPage(tournaments, cursor = None):
+    tournaments = tournaments.order_by("-startDate", "-id")
+
+    if cursor is not None:
+        (startDate, id) = parseCursor(cursor)
+        tournaments = tournaments.filter(Q(startDate__lt = startDate) | Q(startDate = startDate, id__lt = id))
+
+    # One more tournament than is shown is loaded, to find out whether there is another page
+    page = list(tournaments[:PAGE_SIZE + 1])
+
+    if len(page) > PAGE_SIZE:
+        return page[:PAGE_SIZE], formatCursor(page[PAGE_SIZE - 1])
+    else:
+        return page, None
@@ -0,0 +1,28 @@
+# BaseCommand allows the worker to be run with manage.py
+from django.core.management.base import BaseCommand
+
+# sleep waits between checks of the queue when it is empty
+from time import sleep
+
+# Makes the PDFs in the queue
+from tournament.exports import processPendingJobs
+
+# Makes tournament PDFs in the background, so they are not made while a user waits for a response
+# Run with "python manage.py runpdfworker" alongside the web server
+class Command(BaseCommand):
+    help = "Makes the tournament PDFs which have been asked for"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action = "store_true", help = "Make the PDFs in the queue and then stop")
+        parser.add_argument("--interval", type = float, default = 1, help = "Seconds to wait between checks of the queue when it is empty")
+
+    def handle(self, *args, **options):
+        while True:
+            processed = processPendingJobs()
+            if processed != 0:
+                self.stdout.write("Made {} PDF(s)".format(processed))
+
+            if options["once"] == True:
+                break
+
+            sleep(options["interval"])
@@ -0,0 +1,23 @@
+# Generated by Django 3.0.14 on 2026-10-18 16:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0009_auto_20190408_1629'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournament',
+            name='maxGroupSize',
+            field=models.IntegerField(default=5),
+        ),
+        migrations.AddField(
+            model_name='tournament',
+            name='minGroupSize',
+            field=models.IntegerField(default=3),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 3.0.14 on 2026-10-18 16:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0010_auto_20261018_1604'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='tournament',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='tournament.Tournament'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['tournament', 'startTime'], name='tournament__tournam_c69fa1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['team1', 'tournament'], name='tournament__team1_i_db9783_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['team2', 'tournament'], name='tournament__team2_i_b44086_idx'),
+        ),
+    ]
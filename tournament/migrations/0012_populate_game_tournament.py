@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+# Sets the tournament of every existing game to the tournament of its pitch's timeslot
+def populateGameTournament(apps, schema_editor):
+    Tournament = apps.get_model("tournament", "Tournament")
+    Game = apps.get_model("tournament", "Game")
+
+    for tournament in Tournament.objects.all():
+        Game.objects.filter(pitch__timeslot__tournament = tournament).update(tournament = tournament)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0011_auto_20261018_1612'),
+    ]
+
+    operations = [
+        migrations.RunPython(populateGameTournament, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 3.0.14 on 2026-10-18 16:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0012_populate_game_tournament'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='game',
+            name='tournament',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='tournament.Tournament'),
+        ),
+    ]
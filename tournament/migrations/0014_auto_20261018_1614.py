@@ -0,0 +1,39 @@
+# Generated by Django 3.0.14 on 2026-10-18 16:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0005_auto_20190408_1629'),
+        ('tournament', '0013_auto_20261018_1612'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Standing',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('played', models.IntegerField(default=0)),
+                ('won', models.IntegerField(default=0)),
+                ('drawn', models.IntegerField(default=0)),
+                ('lost', models.IntegerField(default=0)),
+                ('pointsFor', models.IntegerField(default=0)),
+                ('pointsAgainst', models.IntegerField(default=0)),
+                ('points', models.IntegerField(default=0)),
+                ('pitch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='tournament.PitchInstance')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='team.Team')),
+                ('tournament', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='tournament.Tournament')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='standing',
+            index=models.Index(fields=['tournament', 'pitch'], name='tournament__tournam_78935a_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='standing',
+            unique_together={('pitch', 'team')},
+        ),
+    ]
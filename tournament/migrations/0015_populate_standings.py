@@ -0,0 +1,54 @@
+from django.db import migrations
+
+
+# The league points a team gets for winning, drawing and losing a game when the standings were added
+WIN_POINTS = 4
+DRAW_POINTS = 2
+LOSS_POINTS = 0
+BYE_TEAM_ID = 1
+
+
+# Adds the standings for every tournament whose layout has already been chosen, including any results already added
+def populateStandings(apps, schema_editor):
+    Game = apps.get_model("tournament", "Game")
+    Standing = apps.get_model("tournament", "Standing")
+
+    # The standing of each team on each pitch, keyed by pitch and team
+    standings = {}
+
+    for game in Game.objects.exclude(team1_id = BYE_TEAM_ID).exclude(team2_id = BYE_TEAM_ID).order_by("id"):
+        for (team, scoreFor, scoreAgainst) in ((game.team1_id, game.team1Score, game.team2Score), (game.team2_id, game.team2Score, game.team1Score)):
+            key = (game.pitch_id, team)
+            if key not in standings:
+                standings[key] = Standing(tournament_id = game.tournament_id, pitch_id = game.pitch_id, team_id = team)
+            standing = standings[key]
+
+            # If the game has no result the team is still in the standings, but nothing is added
+            if scoreFor is None or scoreAgainst is None:
+                continue
+
+            standing.played += 1
+            standing.pointsFor += scoreFor
+            standing.pointsAgainst += scoreAgainst
+            if scoreFor > scoreAgainst:
+                standing.won += 1
+                standing.points += WIN_POINTS
+            elif scoreFor == scoreAgainst:
+                standing.drawn += 1
+                standing.points += DRAW_POINTS
+            else:
+                standing.lost += 1
+                standing.points += LOSS_POINTS
+
+    Standing.objects.bulk_create(standings.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0014_auto_20261018_1614'),
+    ]
+
+    operations = [
+        migrations.RunPython(populateStandings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.0.14 on 2026-10-18 16:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0015_populate_standings'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tournament',
+            name='startDate',
+            field=models.DateField(db_index=True),
+        ),
+    ]
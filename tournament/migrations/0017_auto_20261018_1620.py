@@ -0,0 +1,34 @@
+# Generated by Django 3.0.14 on 2026-10-18 16:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0016_auto_20261018_1617'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PDFExport',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(max_length=64)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=16)),
+                ('pdf', models.BinaryField(null=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('finished', models.DateTimeField(null=True)),
+                ('tournament', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='tournament.Tournament')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='pdfexport',
+            index=models.Index(fields=['status', 'created'], name='tournament__status_0aa6ab_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='pdfexport',
+            unique_together={('tournament', 'version')},
+        ),
+    ]
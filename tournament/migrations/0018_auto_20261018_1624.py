@@ -0,0 +1,24 @@
+# Generated by Django 3.0.14 on 2026-10-18 16:24
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0017_auto_20261018_1620'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournament',
+            name='scheduleUpdated',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='tournament',
+            name='scheduleVersion',
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 3.0.14 on 2026-10-18 16:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0018_auto_20261018_1624'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='scoreVersion',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='tournament',
+            name='layoutVersion',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['tournament', 'scoreVersion'], name='tournament__tournam_b86f5f_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.0.14 on 2026-10-18 16:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0019_auto_20261018_1626'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pdfexport',
+            name='started',
+            field=models.DateTimeField(null=True),
+        ),
+    ]
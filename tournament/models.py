@@ -1,9 +1,18 @@
 # models allows use of API to access database
+# F allows a field to be updated from its current value in the database
 from django.db import models
+from django.db.models import F, Q
+
+# post_save and receiver allow tournaments to be updated when a team is renamed
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 
 # reverse returns a URL path depending on its parameters
 from django.urls import reverse
 
+# timezone gives the time the schedule of a tournament was last changed
+from django.utils import timezone
+
 # Enables records from tables in team app to be used as foreign keys
 from team.models import Team, Membership
 
@@ -21,8 +30,17 @@ class Tournament(models.Model):
     halfDuration = models.IntegerField()
     halfTimeDuration = models.IntegerField()
     swapTeamsDuration = models.IntegerField()
-    startDate = models.DateField()
+    startDate = models.DateField(db_index = True)
     startTime = models.TimeField()
+    # The smallest and largest number of teams that can play on a pitch in a timeslot
+    minGroupSize = models.IntegerField(default = 3)
+    maxGroupSize = models.IntegerField(default = 5)
+    # The version of the tournament's schedule and when it was last changed
+    # The version goes up whenever a layout is chosen or changed, results are added or a team in it is renamed, so browsers can tell whether their copy is up to date
+    scheduleVersion = models.IntegerField(default = 0)
+    scheduleUpdated = models.DateTimeField(default = timezone.now)
+    # The schedule version when the current layout was chosen or a team in it was renamed, so clients following the scores know when every game has changed
+    layoutVersion = models.IntegerField(default = 0)
 
     def __str__(self):
         return self.name
@@ -76,6 +94,9 @@ class PitchInstance(models.Model):
     def __str__(self):
         return "Pitch {}".format(self.name)
 
+# The id of the BYE team record in the team database
+BYE_TEAM_ID = 1
+
 class Game(models.Model):
     team1 = models.ForeignKey(Team, related_name = "team1", on_delete = models.CASCADE)
     team2 = models.ForeignKey(Team, related_name = "team2", on_delete = models.CASCADE)
@@ -83,6 +104,93 @@ class Game(models.Model):
     team2Score = models.IntegerField(null = True)
     startTime = models.TimeField()
     pitch = models.ForeignKey(PitchInstance, on_delete = models.CASCADE)
+    # The tournament the game is in, which is also the tournament of its pitch's timeslot
+    # It is stored on the game so every game in a tournament can be loaded without going through the timeslots and pitches
+    tournament = models.ForeignKey(Tournament, on_delete = models.CASCADE)
+    # The schedule version of the tournament when the scores of the game last changed, so only games with new scores are sent to clients
+    scoreVersion = models.IntegerField(default = 0)
+
+    class Meta:
+        # Indexes for loading the games in a tournament in order, and the games a team plays in a tournament
+        indexes = [
+            models.Index(fields = ["tournament", "startTime"]),
+            models.Index(fields = ["team1", "tournament"]),
+            models.Index(fields = ["team2", "tournament"]),
+            models.Index(fields = ["tournament", "scoreVersion"]),
+        ]
 
     def __str__(self):
         return "{}: {} vs {} ({})".format(self.startTime, self.team1, self.team2, self.pitch)
+
+# Standings table in database, with one record for each team in each group
+# A group is a pitch within a timeslot, as every team on a pitch plays every other team on that pitch
+# The records are updated as results are added, so the standings never need to be worked out from every game
+class Standing(models.Model):
+    tournament = models.ForeignKey(Tournament, on_delete = models.CASCADE)
+    pitch = models.ForeignKey(PitchInstance, on_delete = models.CASCADE)
+    team = models.ForeignKey(Team, on_delete = models.CASCADE)
+    played = models.IntegerField(default = 0)
+    won = models.IntegerField(default = 0)
+    drawn = models.IntegerField(default = 0)
+    lost = models.IntegerField(default = 0)
+    pointsFor = models.IntegerField(default = 0)
+    pointsAgainst = models.IntegerField(default = 0)
+    points = models.IntegerField(default = 0)
+
+    class Meta:
+        # Each team has one record in each group it plays in
+        unique_together = [["pitch", "team"]]
+        indexes = [
+            models.Index(fields = ["tournament", "pitch"]),
+        ]
+
+    def __str__(self):
+        return "{}: {} points ({})".format(self.team, self.points, self.pitch)
+
+# PDF export table in database, which is used as a queue of PDFs for the background worker to make
+# Each PDF is stored against the version of the schedule it was made from, so it can be served again until the schedule changes
+class PDFExport(models.Model):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUSES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    tournament = models.ForeignKey(Tournament, on_delete = models.CASCADE)
+    version = models.CharField(max_length = 64)
+    status = models.CharField(max_length = 16, choices = STATUSES, default = PENDING)
+    pdf = models.BinaryField(null = True)
+    created = models.DateTimeField(auto_now_add = True)
+    # When a worker started making the PDF, so a PDF whose worker stopped part way through can be made again
+    started = models.DateTimeField(null = True)
+    finished = models.DateTimeField(null = True)
+
+    class Meta:
+        # There is one PDF for each version of a tournament's schedule
+        unique_together = [["tournament", "version"]]
+        indexes = [
+            models.Index(fields = ["status", "created"]),
+        ]
+
+    def __str__(self):
+        return "PDF of {} ({})".format(self.tournament, self.status)
+
+# Team names are shown in the schedules, PDFs and exports of the tournaments a team is in, so renaming a team changes each of them
+# Clients following the scores are told to reload every game, as the games whose scores have not changed would otherwise keep the old name
+# The tournaments are all updated in a single query, and a new team is not in any tournament yet
+@receiver(post_save, sender = Team)
+def bumpTeamTournaments(sender, instance, created, **kwargs):
+    if created == True:
+        return
+
+    tournaments = Tournament.objects.filter(Q(enrollment__team = instance) | Q(invite__team = instance))
+    Tournament.objects.filter(pk__in = tournaments.values("pk")).update(
+        scheduleVersion = F("scheduleVersion") + 1,
+        scheduleUpdated = timezone.now(),
+        layoutVersion = F("scheduleVersion") + 1
+    )
@@ -0,0 +1,24 @@
+# Imports database tables
+from team import models as teamModels
+
+# Determines whether the user making a request is a tournament organiser and therefore has permission to perform certain tasks
+# A user is an organiser if they are an administrator of a team which is enrolled in the tournament as an organiser
+# This is answered with a single EXISTS query, and the answer is remembered for the rest of the request
+def isOrganiser(request, tournamentSelected):
+    # Users who are not logged in cannot organise a tournament
+    if request.user.is_authenticated == False:
+        return False
+
+    # The answers already worked out during this request, keyed by tournament
+    if not hasattr(request, "organiserOf"):
+        request.organiserOf = {}
+
+    if tournamentSelected.pk not in request.organiserOf:
+        request.organiserOf[tournamentSelected.pk] = teamModels.Membership.objects.filter(
+            user_id = request.user.pk,
+            administrator = True,
+            team__enrollment__tournament = tournamentSelected,
+            team__enrollment__organiser = True
+        ).exists()
+
+    return request.organiserOf[tournamentSelected.pk]
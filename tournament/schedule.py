@@ -0,0 +1,101 @@
+# transaction allows the whole schedule to be added to the database in one go
+from django.db import transaction
+
+# Prefetch allows the pitches and games to be loaded in order alongside the timeslots
+# F allows the schedule version to be increased by the database
+from django.db.models import F, Max, Prefetch
+
+# timezone gives the time the schedule of a tournament was changed
+from django.utils import timezone
+
+# Imports database tables
+from team import models as teamModels
+from . import models
+
+# Creates the standings for each team in each group
+from .standings import createStandings
+
+# The id of the BYE team record in the team database
+from .models import BYE_TEAM_ID
+
+# Records that the schedule of a tournament has changed, so browsers holding an older copy of it load it again
+# If the layout has changed, the new version is also recorded as the version the layout was chosen at
+# The version is increased by the database, so two changes made at the same time are both counted
+def bumpScheduleVersion(tournamentSelected, layoutChanged = False):
+    now = timezone.now()
+    updates = {"scheduleVersion": F("scheduleVersion") + 1, "scheduleUpdated": now}
+    if layoutChanged == True:
+        updates["layoutVersion"] = F("scheduleVersion") + 1
+    models.Tournament.objects.filter(pk = tournamentSelected.pk).update(**updates)
+    tournamentSelected.refresh_from_db(fields = ["scheduleVersion", "layoutVersion"])
+    tournamentSelected.scheduleUpdated = now
+
+# Adds the timeslots, pitches and games of a tournament layout to the database for a tournament
+# Each table is added to with a single bulk insert inside one transaction, rather than saving and committing each record on its own
+def commitSchedule(tournamentSelected, tournament):
+    with transaction.atomic():
+        # The BYE team record is only looked up once, and only if the layout has any bye games
+        if tournament.getNumOfByeGames() > 0:
+            byeTeam = teamModels.Team.objects.get(id = BYE_TEAM_ID)
+        else:
+            byeTeam = None
+
+        # The largest timeslot id before any are added, so only the records added here are read back
+        lastTimeslotId = models.Timeslot.objects.aggregate(Max("id"))["id__max"] or 0
+
+        # Every timeslot is added to the database
+        models.Timeslot.objects.bulk_create([models.Timeslot(number = i + 1, tournament = tournamentSelected) for i in range(tournament.getNumOfTimeslots())])
+        # bulk_create does not set the primary keys of the records on SQLite, so the timeslots are read back in the order they were added
+        timeslots = list(tournamentSelected.timeslot_set.filter(id__gt = lastTimeslotId).order_by("number"))
+
+        # Every pitch in every timeslot is added to the database
+        models.PitchInstance.objects.bulk_create([
+            models.PitchInstance(name = j + 1, timeslot = timeslots[i])
+            for i in range(tournament.getNumOfTimeslots())
+            for j in range(tournament.timeslot(i).getNumOfPitches())
+        ])
+        # The pitches in the timeslots just added are read back in the order they were added
+        pitches = list(models.PitchInstance.objects.filter(timeslot__tournament = tournamentSelected, timeslot__id__gt = lastTimeslotId).order_by("timeslot__number", "id"))
+
+        games = []
+        # The index of the pitch record for the pitch being added
+        p = 0
+
+        # For each pitch in each timeslot in the tournament
+        for i in range(tournament.getNumOfTimeslots()):
+            for j in range(tournament.timeslot(i).getNumOfPitches()):
+                pitch = tournament.timeslot(i).pitch(j)
+
+                # For each game on the pitch
+                for k in range(pitch.getNumOfGames()):
+                    # The teams in the game
+                    (team1, team2) = pitch.game(k).getGame()
+
+                    # If either team is a bye team it is assigned the BYE team record in the team database
+                    if team1 == "BYE":
+                        team1 = byeTeam
+                    elif team2 == "BYE":
+                        team2 = byeTeam
+
+                    games.append(models.Game(team1 = team1, team2 = team2, startTime = pitch.game(k).getStartTime(), pitch = pitches[p], tournament = tournamentSelected))
+
+                p += 1
+
+        # Every game is added to the database
+        models.Game.objects.bulk_create(games)
+
+        # A standing with no results is added for each team on each pitch
+        models.Standing.objects.bulk_create(createStandings(tournamentSelected, tournament, pitches))
+
+# Returns every game in a tournament in the order they were added, with the teams playing in each game
+# The games are loaded in a single query when the queryset is first used
+def loadGames(tournamentSelected):
+    return models.Game.objects.filter(tournament = tournamentSelected).select_related("team1", "team2").order_by("id")
+
+# Returns the timeslots of a tournament in order, with their pitches and the games on each pitch already loaded
+# The whole schedule is loaded in three queries however many timeslots, pitches and games there are
+def loadSchedule(tournamentSelected):
+    return list(tournamentSelected.timeslot_set.order_by("number").prefetch_related(
+        Prefetch("pitchinstance_set", queryset = models.PitchInstance.objects.order_by("id")),
+        Prefetch("pitchinstance_set__game_set", queryset = models.Game.objects.select_related("team1", "team2").order_by("id"))
+    ))
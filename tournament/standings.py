@@ -0,0 +1,105 @@
+# F refers to the value of a field in the database, so standings can be updated without loading them first
+from django.db.models import F
+
+# Imports database tables
+from . import models
+
+# The league points a team gets for winning, drawing and losing a game
+WIN_POINTS = 4
+DRAW_POINTS = 2
+LOSS_POINTS = 0
+
+# The fields of a standing which change when a result is added
+RESULT_FIELDS = ["played", "won", "drawn", "lost", "pointsFor", "pointsAgainst", "points"]
+
+# Returns the standing records for each team on each pitch of a tournament layout, ready to be added to the database
+# pitches holds the pitch records for the layout in the same order as the pitches in the layout
+# The bye team is not included, as it does not have a place in the standings
+def createStandings(tournamentSelected, tournament, pitches):
+    standings = []
+    # The index of the pitch record for the pitch being added
+    p = 0
+
+    # For each pitch in each timeslot in the tournament
+    for i in range(tournament.getNumOfTimeslots()):
+        for j in range(tournament.timeslot(i).getNumOfPitches()):
+            pitch = tournament.timeslot(i).pitch(j)
+
+            for k in range(pitch.getNumOfTeams()):
+                team = pitch.team(k).getTeam()
+                if team != "BYE":
+                    standings.append(models.Standing(tournament = tournamentSelected, pitch = pitches[p], team = team))
+
+            p += 1
+
+    return standings
+
+# Returns how a result changes the standing of a team which scored scoreFor and conceded scoreAgainst
+def calcResult(scoreFor, scoreAgainst):
+    result = {
+        "played": 1,
+        "won": 0,
+        "drawn": 0,
+        "lost": 0,
+        "pointsFor": scoreFor,
+        "pointsAgainst": scoreAgainst
+    }
+
+    if scoreFor > scoreAgainst:
+        result["won"] = 1
+        result["points"] = WIN_POINTS
+    elif scoreFor == scoreAgainst:
+        result["drawn"] = 1
+        result["points"] = DRAW_POINTS
+    else:
+        result["lost"] = 1
+        result["points"] = LOSS_POINTS
+
+    return result
+
+# Updates the standings for games whose scores have changed
+# changes holds a game along with its old scores and its new scores for each game that has changed, where a score of None means no result
+# The old result is taken away and the new result is added, so only the standings of the teams in those games are updated
+def applyResults(changes):
+    # The change to each field of each standing, keyed by pitch and team
+    deltas = {}
+
+    for (game, oldScores, newScores) in changes:
+        # Games against the bye team are not included in the standings
+        if game.team1_id == models.BYE_TEAM_ID or game.team2_id == models.BYE_TEAM_ID:
+            continue
+
+        for (sign, (team1Score, team2Score)) in ((-1, oldScores), (1, newScores)):
+            # If there was no result there is nothing to take away or add
+            if team1Score is None or team2Score is None:
+                continue
+
+            for (team, result) in ((game.team1_id, calcResult(team1Score, team2Score)), (game.team2_id, calcResult(team2Score, team1Score))):
+                delta = deltas.setdefault((game.pitch_id, team), dict.fromkeys(RESULT_FIELDS, 0))
+                for field in RESULT_FIELDS:
+                    delta[field] += sign * result[field]
+
+    # Each standing that has changed is updated in the database
+    for ((pitch, team), delta) in deltas.items():
+        updates = {field: F(field) + value for (field, value) in delta.items() if value != 0}
+        if updates:
+            models.Standing.objects.filter(pitch_id = pitch, team_id = team).update(**updates)
+
+# Returns the standings for a tournament grouped by pitch, in timeslot and pitch order
+# Within each group the teams are ordered by points, then by points difference, then by points scored
+def loadStandings(tournamentSelected):
+    standings = (
+        models.Standing.objects.filter(tournament = tournamentSelected)
+        .select_related("team", "pitch__timeslot")
+        .annotate(pointsDifference = F("pointsFor") - F("pointsAgainst"))
+        .order_by("pitch__timeslot__number", "pitch_id", "-points", "-pointsDifference", "-pointsFor", "team__name")
+    )
+
+    groups = []
+    for standing in standings:
+        # A new group is started whenever the pitch changes
+        if len(groups) == 0 or groups[-1][0] != standing.pitch:
+            groups.append((standing.pitch, []))
+        groups[-1][1].append(standing)
+
+    return groups
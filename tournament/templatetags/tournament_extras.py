@@ -2,17 +2,34 @@
 from django import template
 register = template.Library()
 
-# Procedure that takes tournament details as its input and produces tournament options as its output
-from utils.organise import main as organise
+# Allows the time spent searching for tournament options to be set in settings.py
+from django.conf import settings
+
+# Records how long each stage of the search took
+import logging
+logger = logging.getLogger(__name__)
+
+# Function that takes tournament details as its input and produces the best tournament options as its output
+from utils.organise import getBestTournaments
+
+# get_template loads the template the list of options is rendered with
+from django.template.loader import get_template
+
+# Stores the options shown so the organiser chooses exactly the option they saw, and the list of options once it is rendered
+from tournament.candidates import cacheOptions, cacheFragment, getCachedFragment
 
 # Returns HTML containing list of tournament options
-@register.inclusion_tag('tournament/displayTournaments.html')
-def displayTournaments(tournament, userIsOrganiser, tournament_pk):
+# enrollments holds the enrollments of the teams partaking in the tournament, with their teams
+# The HTML is stored until the settings or teams of the tournament change, so the options are only worked out and rendered once
+@register.simple_tag
+def displayTournaments(tournament, enrollments, userIsOrganiser, tournament_pk):
     # Teams partaking in the tournament
-    teams = [enrollment.team for enrollment in tournament.enrollment_set.all()]
+    teams = [enrollment.team for enrollment in enrollments]
 
-    # The possible options for the tournament
-    tournaments = organise(teams, tournament.pitches, tournament.halfDuration, tournament.halfTimeDuration, tournament.swapTeamsDuration, tournament.startTime.hour, tournament.startTime.minute)
+    # If the list of options has already been rendered for these settings and teams it is returned straight away
+    fragment = getCachedFragment(tournament, teams, userIsOrganiser)
+    if fragment is not None:
+        return fragment
 
     # Will hold all of possible tournament options in nested loops as opposed to objects
     tournamentList = []
@@ -20,33 +37,48 @@ def displayTournaments(tournament, userIsOrganiser, tournament_pk):
     # Will hold information about each tournament option
     tournamentsInfo = []
 
-    # For each potential tournament
-    for i in range(len(tournaments)):
-        # Add an empty list to the list of tournaments
+    # The best potential tournaments found within the time budget, best first
+    options = getBestTournaments(teams, tournament.pitches, tournament.halfDuration, tournament.halfTimeDuration, tournament.swapTeamsDuration, tournament.startTime.hour, tournament.startTime.minute, tournament.minGroupSize, tournament.maxGroupSize, timeBudget = settings.ORGANISE_TIME_BUDGET)
+    logger.info("Tournament %s options searched in %s (complete: %s)", tournament_pk, options.getTimings(), options.isComplete())
+
+    # For each of the best potential tournaments, best first
+    for (i, option) in enumerate(options):
+        # Add an empty list to the list of tournaments
         tournamentList.append([])
 
         # Calculate the duration of the tournament in hours and minutes
-        tournamentDuration = tournaments[i].getDuration().seconds
+        tournamentDuration = option.getDuration().seconds
         tournamentHours = tournamentDuration // 3600
         tournamentMinutes = int((tournamentDuration % 3600) / 60)
 
-        # Append the tournament duration in hours and mins, as well as the number of bye games and non-bye games to tournamentInfo list
-        tournamentsInfo.append([[tournamentHours, tournamentMinutes], tournaments[i].getNumOfNonByeGames(), tournaments[i].getNumOfByeGames()])
+        # Append the tournament duration in hours and mins, the number of bye games and non-bye games, and the number used to choose the option to tournamentInfo list
+        tournamentsInfo.append([[tournamentHours, tournamentMinutes], option.getNumOfNonByeGames(), option.getNumOfByeGames(), option.getNumber()])
 
         # For each timeslot
-        for j in range(tournaments[i].getNumOfTimeslots()):
+        for j in range(option.getNumOfTimeslots()):
             tournamentList[i].append([])
 
             # For each pitch
-            for k in range(tournaments[i].timeslot(j).getNumOfPitches()):
+            for k in range(option.timeslot(j).getNumOfPitches()):
                 tournamentList[i][j].append([])
 
                 # For each game
-                for l in range(tournaments[i].timeslot(j).pitch(k).getNumOfGames()):
+                for l in range(option.timeslot(j).pitch(k).getNumOfGames()):
                     # Add the game start time and teams playing to the nested list
-                    tournamentList[i][j][k].append([tournaments[i].timeslot(j).pitch(k).game(l).getStartTime().strftime("%H:%M"), tournaments[i].timeslot(j).pitch(k).game(l).getGame()])
+                    game = option.timeslot(j).pitch(k).game(l)
+                    tournamentList[i][j][k].append([game.getStartTime().strftime("%H:%M"), game.getGame()])
+
+    # The options are stored with their games so choosing one does not need to work them out again
+    cacheOptions(tournament, teams, options)
+
+    fragment = get_template("tournament/displayTournaments.html").render({
+        "tournaments": zip(tournamentList, tournamentsInfo),
+        "searchComplete": options.isComplete(),
+        "userIsOrganiser": userIsOrganiser,
+        "tournament_pk": tournament_pk
+    })
+
+    # The rendered list is stored after the options in it, so it is never used without them
+    cacheFragment(tournament, teams, userIsOrganiser, fragment)
 
-    return {"tournaments": zip(tournamentList, tournamentsInfo),
-            "userIsOrganiser": userIsOrganiser,
-            "tournament_pk": tournament_pk
-            }
+    return fragment
@@ -1,7 +1,38 @@
-from django.test import TestCase
+import csv
+import json
+from datetime import datetime, timedelta
 
-from . import models
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.signals import request_started, request_finished
+from django.db import close_old_connections, connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from unittest import mock
+
+from . import candidates, exports, feed, forms, listing, models, permissions, schedule, standings
+from .templatetags import tournament_extras
+from account.models import User
 from team import models as teamModels
+from mysite import asgi
+from utils.organise import getBestTournaments, getTournament
+
+# Creates a tournament with the number of pitches given, starting on the date given
+def createTournament(pitches, startDate = "2021-01-01"):
+    return models.Tournament.objects.create(
+        name = "Test Tournament",
+        location = "Test Location",
+        pitches = pitches,
+        halfDuration = 10,
+        halfTimeDuration = 5,
+        swapTeamsDuration = 3,
+        startDate = startDate,
+        startTime = "10:30",
+    )
 
 class InviteTestCase(TestCase):
     def setUp(self):
@@ -26,3 +57,488 @@ class InviteTestCase(TestCase):
 
     def test_string_representation(self):
         self.assertEqual(str(self.invite), "Test Team is invited to Test Tournament")
+
+class ScheduleTestCase(TestCase):
+    def setUp(self):
+        self.tournament = createTournament(pitches = 2)
+        self.byeTeam = teamModels.Team.objects.create(id = schedule.BYE_TEAM_ID, name = "BYE")
+        self.teams = [teamModels.Team.objects.create(name = "Team {}".format(i)) for i in range(23)]
+
+    def test_schedule_is_committed_in_a_few_queries(self):
+        layout = getTournament(self.teams, 2, 10, 5, 3, 10, 30, 1)
+        self.assertGreater(layout.getNumOfByeGames(), 0)
+
+        with CaptureQueriesContext(connection) as queries:
+            schedule.commitSchedule(self.tournament, layout)
+
+        # Savepoints aside, the number of queries does not depend on the number of games
+        self.assertLessEqual(len([query for query in queries if "SAVEPOINT" not in query["sql"]]), 8)
+
+        games = models.Game.objects.filter(tournament = self.tournament).order_by("id")
+        self.assertEqual(self.tournament.timeslot_set.count(), layout.getNumOfTimeslots())
+        self.assertEqual(len(games), layout.getNumOfByeGames() + layout.getNumOfNonByeGames())
+        self.assertEqual(games.filter(team2 = self.byeTeam).count() + games.filter(team1 = self.byeTeam).count(), layout.getNumOfByeGames())
+
+        # The games are added in the same order as the layout, on the right pitch
+        first = layout.timeslot(0).pitch(0).game(0)
+        self.assertEqual([games[0].team1, games[0].team2], first.getGame())
+        self.assertEqual(games[0].startTime, first.getStartTime().time())
+        self.assertEqual(games[0].pitch.name, "1")
+        self.assertEqual(games[0].pitch.timeslot.number, 1)
+
+class CandidatesTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.tournament = createTournament(pitches = 2)
+        self.tournament.refresh_from_db()
+        self.teams = [teamModels.Team.objects.create(name = "Team {}".format(i)) for i in range(20)]
+
+    def test_option_shown_is_option_chosen(self):
+        options = getBestTournaments(self.teams, 2, 10, 5, 3, 10, 30)
+        candidates.cacheOptions(self.tournament, self.teams, options)
+
+        option = candidates.getCachedOption(self.tournament, self.teams, options[1].getNumber())
+        self.assertEqual(option.getFingerprint(), options[1].getFingerprint())
+        self.assertEqual(option.timeslot(0).pitch(0).game(0).getGame(), options[1].timeslot(0).pitch(0).game(0).getGame())
+        self.assertIsNone(candidates.getCachedOption(self.tournament, self.teams, 0))
+
+    def test_changes_invalidate_options(self):
+        options = getBestTournaments(self.teams, 2, 10, 5, 3, 10, 30)
+        candidates.cacheOptions(self.tournament, self.teams, options)
+        num = options[0].getNumber()
+
+        # A team leaving the tournament
+        self.assertIsNone(candidates.getCachedOption(self.tournament, self.teams[:-1], num))
+
+        # The settings being edited
+        self.tournament.pitches = 3
+        self.assertIsNone(candidates.getCachedOption(self.tournament, self.teams, num))
+
+    def test_rendered_options_are_cached(self):
+        enrollments = [models.Enrollment.objects.create(tournament = self.tournament, team = team) for team in self.teams]
+
+        with mock.patch("tournament.templatetags.tournament_extras.getBestTournaments", wraps = getBestTournaments) as search:
+            fragment = tournament_extras.displayTournaments(self.tournament, enrollments, True, self.tournament.pk)
+            self.assertEqual(tournament_extras.displayTournaments(self.tournament, enrollments, True, self.tournament.pk), fragment)
+            self.assertEqual(search.call_count, 1)
+
+            # Non-organisers are not shown the buttons to choose an option
+            self.assertNotIn("Choose", tournament_extras.displayTournaments(self.tournament, enrollments, False, self.tournament.pk))
+            self.assertEqual(search.call_count, 2)
+
+            # A team being renamed and the settings being edited
+            self.teams[0].name = "Renamed Team"
+            self.assertIn("Renamed Team", tournament_extras.displayTournaments(self.tournament, enrollments, True, self.tournament.pk))
+            self.tournament.halfDuration = 7
+            tournament_extras.displayTournaments(self.tournament, enrollments, True, self.tournament.pk)
+            self.assertEqual(search.call_count, 4)
+
+class ScheduleLoaderTestCase(TestCase):
+    def setUp(self):
+        teamModels.Team.objects.create(id = schedule.BYE_TEAM_ID, name = "BYE")
+        self.user = User.objects.create_user("organiser@example.com", "Test", "Organiser", "password")
+        self.client.force_login(self.user)
+
+    # Creates a tournament with a layout chosen for the number of teams given, organised by the user
+    def createScheduledTournament(self, numOfTeams):
+        tournament = createTournament(pitches = 2)
+        teams = [teamModels.Team.objects.create(name = "Team {}".format(i)) for i in range(numOfTeams)]
+        for team in teams:
+            models.Enrollment.objects.create(tournament = tournament, team = team, organiser = team == teams[0])
+        teamModels.Membership.objects.create(user = self.user, team = teams[0], administrator = True)
+
+        schedule.commitSchedule(tournament, getTournament(teams, 2, 10, 5, 3, 10, 30, 1))
+        return tournament
+
+    # Adds results to the games of a tournament through the results form, where scores gives the scores of the game at each index
+    def postResults(self, tournament, scores):
+        games = list(schedule.loadGames(tournament))
+        data = {"form-TOTAL_FORMS": len(games), "form-INITIAL_FORMS": len(games), "form-MIN_NUM_FORMS": 0, "form-MAX_NUM_FORMS": 1000}
+        for (i, game) in enumerate(games):
+            data["form-{}-id".format(i)] = game.pk
+            (data["form-{}-team1Score".format(i)], data["form-{}-team2Score".format(i)]) = scores(i)
+        self.assertEqual(self.client.post(reverse("tournament:addResults", args = [tournament.pk]), data).status_code, 302)
+
+    # Returns the number of queries used to load a page for a tournament
+    def countQueries(self, url, tournament):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(url, args = [tournament.pk]))
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_layout_is_only_chosen_once(self):
+        tournament = self.createScheduledTournament(10)
+        self.client.get(reverse("tournament:changeLayout", args = [tournament.pk]))
+
+        # Choosing twice, such as by clicking twice, leaves the layout chosen first
+        url = reverse("tournament:chooseTournament", args = [tournament.pk, 1])
+        self.assertEqual(self.client.get(url).status_code, 302)
+        games = list(schedule.loadGames(tournament).values_list("id", "pitch_id"))
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.assertEqual(list(schedule.loadGames(tournament).values_list("id", "pitch_id")), games)
+        self.assertEqual(models.Timeslot.objects.filter(tournament = tournament).count(), len(schedule.loadSchedule(tournament)))
+        self.assertEqual(models.PitchInstance.objects.filter(timeslot__tournament = tournament).count(), len(set(pitch for (game, pitch) in games)))
+
+    def test_schedule_is_loaded_in_three_queries(self):
+        tournament = self.createScheduledTournament(20)
+
+        with self.assertNumQueries(3):
+            games = [(game.team1.name, game.team2.name) for timeslot in schedule.loadSchedule(tournament) for pitch in timeslot.pitchinstance_set.all() for game in pitch.game_set.all()]
+
+        self.assertEqual(games, [(game.team1.name, game.team2.name) for game in schedule.loadGames(tournament)])
+
+    def test_queries_do_not_grow_with_tournament_size(self):
+        small = self.createScheduledTournament(10)
+        large = self.createScheduledTournament(40)
+
+        # The PDFs are made by the background worker before they are served
+        exports.requestPDF(small)
+        exports.requestPDF(large)
+        exports.processPendingJobs()
+
+        for url in ("tournament:tournament", "tournament:exportAsPDF", "tournament:addResults"):
+            self.assertEqual(self.countQueries(url, small), self.countQueries(url, large))
+
+    def test_pdf_is_made_in_the_background(self):
+        tournament = self.createScheduledTournament(10)
+        url = reverse("tournament:exportAsPDF", args = [tournament.pk])
+
+        # The PDF is queued rather than made during the request
+        self.assertEqual(self.client.get(url).status_code, 202)
+        self.assertEqual(self.client.get(url).status_code, 202)
+        self.assertEqual(exports.processPendingJobs(), 1)
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH = response["ETag"]).status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE = response["Last-Modified"]).status_code, 304)
+
+        # Changing the layout gives a new version, which replaces the old PDF once it has been made
+        game = models.Game.objects.filter(tournament = tournament).first()
+        game.team1, game.team2 = game.team2, game.team1
+        game.save()
+        schedule.bumpScheduleVersion(tournament)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH = response["ETag"]).status_code, 202)
+        exports.processPendingJobs()
+        self.assertNotEqual(self.client.get(url)["ETag"], response["ETag"])
+        self.assertEqual(models.PDFExport.objects.filter(tournament = tournament).count(), 1)
+
+    def test_pdfs_left_by_a_stopped_worker_are_made_again(self):
+        tournament = self.createScheduledTournament(10)
+        export = exports.requestPDF(tournament)
+        self.assertEqual(exports.claimNextJob().pk, export.pk)
+
+        # The worker stops part way through, and the PDF is only made again once it has been running for too long
+        self.assertIsNone(exports.claimNextJob())
+        models.PDFExport.objects.filter(pk = export.pk).update(started = timezone.now() - timedelta(seconds = exports.JOB_TIMEOUT + 1))
+        self.assertEqual(exports.requestPDF(tournament).status, models.PDFExport.PENDING)
+        job = exports.claimNextJob()
+        self.assertEqual(job.pk, export.pk)
+
+        # The tournament being deleted while its PDF is made does not stop the worker
+        tournament.delete()
+        exports.processJob(job)
+        self.assertEqual(exports.processPendingJobs(), 0)
+
+    def test_schedule_pages_are_not_sent_again_until_the_schedule_changes(self):
+        tournament = self.createScheduledTournament(10)
+        url = reverse("tournament:tournament", args = [tournament.pk])
+
+        response = self.client.get(url)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH = response["ETag"]).status_code, 304)
+        for export in ("tournament:exportAsCSV", "tournament:exportAsJSON"):
+            exportResponse = self.client.get(reverse(export, args = [tournament.pk]))
+            self.assertEqual(self.client.get(reverse(export, args = [tournament.pk]), HTTP_IF_NONE_MATCH = exportResponse["ETag"]).status_code, 304)
+
+        # Each user is shown a different page, so a browser with a recent copy made for someone else is not told to use it
+        self.assertFalse(response.has_header("Last-Modified"))
+        other = User.objects.create_user("player@example.com", "Test", "Player", "password")
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH = response["ETag"]).status_code, 200)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE = http_date()).status_code, 200)
+        self.client.force_login(self.user)
+
+        # Renaming a team changes the schedule, and clients following the scores are told to reload every game
+        exportResponse = self.client.get(reverse("tournament:exportAsCSV", args = [tournament.pk]))
+        team = models.Enrollment.objects.filter(tournament = tournament).first().team
+        team.name = "Renamed"
+        team.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH = response["ETag"]).status_code, 200)
+        self.assertEqual(self.client.get(reverse("tournament:exportAsCSV", args = [tournament.pk]), HTTP_IF_MODIFIED_SINCE = exportResponse["Last-Modified"], HTTP_IF_NONE_MATCH = exportResponse["ETag"]).status_code, 200)
+        tournament.refresh_from_db()
+        self.assertEqual(tournament.layoutVersion, tournament.scheduleVersion)
+        response = self.client.get(url)
+
+        # Adding results changes the schedule
+        self.postResults(tournament, lambda i: (10, 5))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH = response["ETag"]).status_code, 200)
+
+    def test_score_feed_only_sends_changed_scores(self):
+        tournament = self.createScheduledTournament(10)
+        url = reverse("tournament:scoreFeed", args = [tournament.pk])
+
+        # A new client is sent every game
+        feed = self.client.get(url).json()
+        self.assertTrue(feed["reset"])
+        self.assertEqual(len(feed["games"]), models.Game.objects.filter(tournament = tournament).count())
+
+        # A client with the latest scores is told there are no new ones once it has waited
+        self.assertEqual(self.client.get(url, {"since": feed["version"], "timeout": 0}).json()["games"], [])
+
+        # Only the games whose scores changed are sent
+        self.postResults(tournament, lambda i: (10, 5))
+        changed = self.client.get(url, {"since": feed["version"], "timeout": 0}).json()
+        self.assertFalse(changed["reset"])
+        self.assertEqual(len(changed["games"]), len(feed["games"]))
+        self.postResults(tournament, lambda i: (10, 7) if i == 0 else (10, 5))
+        self.assertEqual([(game["id"], game["team2Score"]) for game in self.client.get(url, {"since": changed["version"], "timeout": 0}).json()["games"]], [(feed["games"][0]["id"], 7)])
+
+        # Changing the layout tells clients to forget the games they have
+        self.client.get(reverse("tournament:changeLayout", args = [tournament.pk]))
+        self.assertEqual(self.client.get(url, {"since": changed["version"], "timeout": 0}).json(), {"version": changed["version"] + 2, "reset": True, "games": []})
+
+    def test_score_feed_view_only_waits_when_asked(self):
+        tournament = self.createScheduledTournament(10)
+        url = reverse("tournament:scoreFeed", args = [tournament.pk])
+
+        # Without ASGI a client which does not give a timeout is answered straight away, and one which does waits for no more than SYNC_POLL_TIMEOUT
+        with mock.patch("tournament.views.waitForChange") as waitForChange:
+            self.client.get(url, {"since": tournament.scheduleVersion})
+            self.client.get(url, {"since": tournament.scheduleVersion, "timeout": 60})
+        self.assertEqual([call.args[2] for call in waitForChange.call_args_list], [0, feed.SYNC_POLL_TIMEOUT])
+
+    # Returns the status and body of a GET request to the ASGI application
+    # Database connections are left open between requests, as the test client does, so the test's transaction is kept
+    def getThroughASGI(self, path, query = ""):
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "http_version": "1.1", "method": "GET", "path": path, "query_string": query.encode(), "headers": [], "root_path": "", "scheme": "http", "server": ("testserver", 80)}
+        request_started.disconnect(close_old_connections)
+        request_finished.disconnect(close_old_connections)
+        try:
+            async_to_sync(asgi.application)(scope, receive, send)
+        finally:
+            request_started.connect(close_old_connections)
+            request_finished.connect(close_old_connections)
+
+        return (messages[0]["status"], b"".join(message.get("body", b"") for message in messages[1:]))
+
+    def test_score_feed_is_answered_through_asgi(self):
+        tournament = self.createScheduledTournament(10)
+        url = reverse("tournament:scoreFeed", args = [tournament.pk])
+
+        (status, body) = self.getThroughASGI(url)
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body), self.client.get(url).json())
+
+        (status, body) = self.getThroughASGI(url, "since={}&timeout=0".format(tournament.scheduleVersion))
+        self.assertEqual(json.loads(body)["games"], [])
+        self.assertEqual(self.getThroughASGI(url, "since=latest")[0], 404)
+
+        # Every other page is answered by Django
+        self.assertEqual(self.getThroughASGI(reverse("tournament:standings", args = [tournament.pk]))[0], 200)
+
+    def test_fixtures_are_streamed_through_asgi(self):
+        tournament = self.createScheduledTournament(10)
+        team = models.Enrollment.objects.filter(tournament = tournament).first().team
+        urls = [
+            reverse("tournament:exportAsCSV", args = [tournament.pk]),
+            reverse("tournament:exportAsJSON", args = [tournament.pk]),
+            reverse("tournament:exportAsCalendar", args = [tournament.pk, team.pk])
+        ]
+
+        # Each export gives the same file through ASGI as it does through WSGI
+        for url in urls:
+            (status, body) = self.getThroughASGI(url)
+            self.assertEqual(status, 200)
+            if url != urls[2]:
+                self.assertEqual(body, b"".join(self.client.get(url).streaming_content))
+            else:
+                self.assertIn(b"BEGIN:VEVENT", body)
+
+    def test_fixtures_are_streamed(self):
+        tournament = self.createScheduledTournament(10)
+        games = list(schedule.loadGames(tournament))
+
+        response = self.client.get(reverse("tournament:exportAsCSV", args = [tournament.pk]))
+        self.assertTrue(response.streaming)
+        rows = list(csv.reader(b"".join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(rows[0], ["id", "timeslot", "pitch", "startTime", "team1", "team2", "team1Score", "team2Score"])
+        self.assertEqual(sorted(int(row[0]) for row in rows[1:]), [game.pk for game in games])
+
+        response = self.client.get(reverse("tournament:exportAsJSON", args = [tournament.pk]))
+        fixtures = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(fixtures["tournament"]["name"], "Test Tournament")
+        self.assertEqual(len(fixtures["games"]), len(games))
+
+        # A team's calendar only has the games it plays in, without its byes
+        team = games[0].team1 if games[0].team1_id != schedule.BYE_TEAM_ID else games[0].team2
+        response = self.client.get(reverse("tournament:exportAsCalendar", args = [tournament.pk, team.pk]))
+        calendar = b"".join(response.streaming_content).decode()
+        played = [game for game in games if team in (game.team1, game.team2) and schedule.BYE_TEAM_ID not in (game.team1_id, game.team2_id)]
+        self.assertEqual(calendar.count("BEGIN:VEVENT"), len(played))
+        self.assertIn("DTSTART:{}".format("20210101T" + played[0].startTime.strftime("%H%M%S")), calendar)
+
+        # Long lines are folded so no line is longer than 75 octets, without splitting any character
+        tournament.location = "Événement à la Fédération Française de Rugby, Stade de la Porte de Saint-Cloud"
+        tournament.save()
+        response = self.client.get(reverse("tournament:exportAsCalendar", args = [tournament.pk, team.pk]))
+        calendar = b"".join(response.streaming_content)
+        self.assertTrue(all(len(line) <= 75 for line in calendar.split(b"\r\n")))
+        self.assertIn("LOCATION:" + tournament.location.replace(",", "\\,"), calendar.decode().replace("\r\n ", ""))
+
+        # Teams which are not competing in the tournament do not have a calendar
+        other = teamModels.Team.objects.create(name = "Other Team")
+        self.assertEqual(self.client.get(reverse("tournament:exportAsCalendar", args = [tournament.pk, other.pk])).status_code, 404)
+
+class StandingsTestCase(TestCase):
+    def setUp(self):
+        self.tournament = createTournament(pitches = 1)
+        teamModels.Team.objects.create(id = models.BYE_TEAM_ID, name = "BYE")
+        self.teams = [teamModels.Team.objects.create(name = "Team {}".format(i)) for i in range(7)]
+        schedule.commitSchedule(self.tournament, getTournament(self.teams, 1, 10, 5, 3, 10, 30, 1))
+        self.games = list(schedule.loadGames(self.tournament))
+
+    # Returns the standings worked out from every game, keyed by team
+    def calcStandings(self):
+        expected = {}
+        for game in models.Game.objects.filter(tournament = self.tournament).exclude(team1Score = None):
+            if game.team1_id == models.BYE_TEAM_ID or game.team2_id == models.BYE_TEAM_ID:
+                continue
+            for (team, scoreFor, scoreAgainst) in ((game.team1_id, game.team1Score, game.team2Score), (game.team2_id, game.team2Score, game.team1Score)):
+                result = standings.calcResult(scoreFor, scoreAgainst)
+                total = expected.setdefault(team, dict.fromkeys(standings.RESULT_FIELDS, 0))
+                for field in standings.RESULT_FIELDS:
+                    total[field] += result[field]
+        return expected
+
+    # Sets the scores of a game and updates the standings for it
+    def setScores(self, game, team1Score, team2Score):
+        changes = [(game, (game.team1Score, game.team2Score), (team1Score, team2Score))]
+        game.team1Score = team1Score
+        game.team2Score = team2Score
+        game.save()
+        standings.applyResults(changes)
+
+    def test_standings_are_updated_incrementally(self):
+        # Every team has a standing, apart from the bye team
+        self.assertEqual(models.Standing.objects.filter(tournament = self.tournament).count(), 7)
+
+        for (i, game) in enumerate(self.games):
+            self.setScores(game, i % 3, 1)
+        # A result is changed, including from a win to a draw
+        self.setScores(self.games[0], 1, 1)
+        self.setScores(self.games[2], 7, 0)
+
+        expected = self.calcStandings()
+        for standing in models.Standing.objects.filter(tournament = self.tournament):
+            self.assertEqual({field: getattr(standing, field) for field in standings.RESULT_FIELDS}, expected[standing.team_id])
+
+    def test_standings_are_ordered_by_points(self):
+        for (i, game) in enumerate(self.games):
+            self.setScores(game, i, 0)
+
+        groups = standings.loadStandings(self.tournament)
+        self.assertEqual(sum(len(group) for (pitch, group) in groups), 7)
+        for (pitch, group) in groups:
+            self.assertTrue(all(standing.pitch == pitch for standing in group))
+            self.assertEqual([standing.points for standing in group], sorted([standing.points for standing in group], reverse = True))
+
+class PermissionsTestCase(TestCase):
+    def setUp(self):
+        self.tournament = createTournament(pitches = 1)
+        organiserTeam = teamModels.Team.objects.create(name = "Organiser Team")
+        otherTeam = teamModels.Team.objects.create(name = "Other Team")
+        models.Enrollment.objects.create(tournament = self.tournament, team = organiserTeam, organiser = True)
+        models.Enrollment.objects.create(tournament = self.tournament, team = otherTeam)
+
+        self.organiser = User.objects.create_user("organiser@example.com", "Test", "Organiser", "password")
+        self.member = User.objects.create_user("member@example.com", "Test", "Member", "password")
+        self.otherAdministrator = User.objects.create_user("other@example.com", "Test", "Other", "password")
+        teamModels.Membership.objects.create(user = self.organiser, team = organiserTeam, administrator = True)
+        teamModels.Membership.objects.create(user = self.member, team = organiserTeam)
+        teamModels.Membership.objects.create(user = self.otherAdministrator, team = otherTeam, administrator = True)
+
+    # Returns a request made by the user given
+    def createRequest(self, user):
+        request = RequestFactory().get("/")
+        request.user = user
+        return request
+
+    def test_organiser_check_is_one_query_per_request(self):
+        request = self.createRequest(self.organiser)
+
+        with self.assertNumQueries(1):
+            self.assertTrue(permissions.isOrganiser(request, self.tournament))
+            self.assertTrue(permissions.isOrganiser(request, self.tournament))
+
+    def test_only_administrators_of_organiser_teams_are_organisers(self):
+        self.assertFalse(permissions.isOrganiser(self.createRequest(self.member), self.tournament))
+        self.assertFalse(permissions.isOrganiser(self.createRequest(self.otherAdministrator), self.tournament))
+        self.assertFalse(permissions.isOrganiser(self.createRequest(AnonymousUser()), self.tournament))
+
+class TournamentListTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("member@example.com", "Test", "Member", "password")
+        self.client.force_login(self.user)
+
+        # The user is a member of two teams which are both enrolled in every tournament
+        teams = [teamModels.Team.objects.create(name = "Team {}".format(i)) for i in range(2)]
+        for team in teams:
+            teamModels.Membership.objects.create(user = self.user, team = team)
+
+        today = datetime.now().date()
+        self.past = []
+        for i in range(listing.PAGE_SIZE + 5):
+            self.past.append(self.createEnrolledTournament(today - timedelta(days = 1 + i // 2), teams))
+        self.upcoming = [self.createEnrolledTournament(today, teams), self.createEnrolledTournament(today + timedelta(days = 3), teams)]
+
+        # Most recent first, and tournaments on the same day newest first
+        self.past.sort(key = lambda tournament: (tournament.startDate, tournament.id), reverse = True)
+
+        # A tournament the user's teams are not in
+        self.createEnrolledTournament(today, [teamModels.Team.objects.create(name = "Other Team")])
+
+    # Creates a tournament on the date given with the teams given enrolled
+    def createEnrolledTournament(self, startDate, teams):
+        tournament = createTournament(pitches = 1, startDate = startDate)
+        for team in teams:
+            models.Enrollment.objects.create(tournament = tournament, team = team)
+        return tournament
+
+    def test_tournaments_are_split_and_paged_most_recent_first(self):
+        response = self.client.get(reverse("tournament:tournamentList"))
+        self.assertEqual(list(response.context["tournamentsUpcoming"]), self.upcoming[::-1])
+        self.assertEqual(list(response.context["tournamentsPast"]), self.past[:listing.PAGE_SIZE])
+
+        # The next page starts straight after the last tournament shown
+        response = self.client.get(reverse("tournament:tournamentList"), {"past": response.context["pastNext"]})
+        self.assertEqual(list(response.context["tournamentsPast"]), self.past[listing.PAGE_SIZE:])
+        self.assertIsNone(response.context["pastNext"])
+
+        self.assertEqual(self.client.get(reverse("tournament:tournamentList"), {"past": "not a cursor"}).status_code, 404)
+
+class TournamentFormTestCase(TestCase):
+    def test_missing_group_sizes_are_field_errors(self):
+        data = {"name": "Test Tournament", "location": "Test Location", "pitches": 2, "halfDuration": 10, "halfTimeDuration": 5, "swapTeamsDuration": 3, "startDate": "2021-01-01", "startTime": "10:30", "minGroupSize": "", "maxGroupSize": 5}
+        form = forms.TournamentForm(data)
+        self.assertFalse(form.is_valid())
+        self.assertIn("minGroupSize", form.errors)
+
+        data["minGroupSize"] = 6
+        self.assertIn("maxGroupSize", forms.TournamentForm(data).errors)
+
+    def test_versions_cannot_be_entered(self):
+        data = {"name": "Test Tournament", "location": "Test Location", "pitches": 2, "halfDuration": 10, "halfTimeDuration": 5, "swapTeamsDuration": 3, "startDate": "2021-01-01", "startTime": "10:30", "minGroupSize": 3, "maxGroupSize": 5}
+        form = forms.TournamentForm(data)
+
+        # The form only has the fields the organiser enters, so it is valid without the versions
+        self.assertEqual(list(form.fields), ["name", "location", "pitches", "halfDuration", "halfTimeDuration", "swapTeamsDuration", "startDate", "startTime", "minGroupSize", "maxGroupSize"])
+        self.assertTrue(form.is_valid())
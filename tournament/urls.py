@@ -16,10 +16,15 @@ urlpatterns = [
     path("<int:pk>/delete/", views.deleteTournament, name = "deleteTournament"),
     path("<int:pk>/add/", views.addTeamsToTournament, name = "addTeamsToTournament"),
     path("<int:pk>/addresults/", views.addResults, name = "addResults"),
+    path("<int:pk>/standings/", views.standings, name = "standings"),
+    path("<int:pk>/scores/", views.scoreFeed, name = "scoreFeed"),
     path("<int:tournament_pk>/invite/<int:team_pk>/", views.inviteTeam, name = "inviteTeam"),
     path("<int:tournament_pk>/remove/<int:enrollment_pk>/", views.removeTeamFromTournament, name = "removeTeamFromTournament"),
     path("<int:tournament_pk>/uninvite/<int:invite_pk>/", views.removeInvite, name = "removeInvite"),
     path("<int:pk>/choose/<int:num>/", views.chooseTournament, name = "chooseTournament"),
     path("<int:pk>/change/", views.changeLayout, name = "changeLayout"),
-    path("<int:pk>/export/", views.exportAsPDF, name = "exportAsPDF")
+    path("<int:pk>/export/", views.exportAsPDF, name = "exportAsPDF"),
+    path("<int:pk>/export/csv/", views.exportAsCSV, name = "exportAsCSV"),
+    path("<int:pk>/export/json/", views.exportAsJSON, name = "exportAsJSON"),
+    path("<int:tournament_pk>/export/calendar/<int:team_pk>/", views.exportAsCalendar, name = "exportAsCalendar")
 ]
@@ -4,23 +4,53 @@ from django.shortcuts import render, get_object_or_404
 
 # HttpResponseRedirect redirects the user to a specific URL
 # HttpResponse generates an HTTP response
-from django.http import HttpResponseRedirect, HttpResponse
+# Http404 is raised if the page being requested does not exist
+# StreamingHttpResponse sends an export a piece at a time, without holding all of it in memory
+# JsonResponse sends the scores of a tournament to clients following them
+from django.http import HttpResponseRedirect, HttpResponse, Http404, StreamingHttpResponse, JsonResponse
 
 # reverse returns a URL path depending on its parameters
 from django.shortcuts import reverse
 
+# transaction allows scores and standings to be saved together
+from django.db import transaction
+
 # datetime allows dates to be stored in python
 # timedelta enables dates to be updated by a certain number of days etc.
 from datetime import datetime, timedelta
 
-# Procedure that takes tournament details as its input and produces tournament options as its output
-from utils.organise import main as organise
+# Function that takes tournament details and an option number as its input and produces that tournament option as its output
+from utils.organise import getTournament
+
+# Splits a list of tournaments into pages, most recent first
+from .listing import getPage
+
+# Adds tournament PDFs to the queue for the background worker
+from .exports import requestPDF
+
+# Writes the fixtures of a tournament as CSV, JSON and iCalendar files
+from .fixtures import streamCSV, streamJSON, streamCalendar
+
+# Determines whether the user making a request is a tournament organiser
+from .permissions import isOrganiser
+
+# Adds a tournament layout to the database in a single transaction, and loads it from the database
+from .schedule import commitSchedule, loadGames, loadSchedule, bumpScheduleVersion
+
+# Sends the scores which have changed to clients following a tournament
+from .feed import SYNC_POLL_TIMEOUT, parseFeedQuery, getScoreFeed, waitForChange
+
+# Tells browsers whether their copy of a page showing a tournament's schedule is up to date
+from .conditional import getValidators, getNotModified, setValidators
 
-# High to low quicksort algorithm which takes values to be sorted and attribute to be sorted by in tuples as parameters
-from utils.quickSort import quickSort
+# Updates the standings as results are added, and loads them from the database
+from .standings import applyResults, loadStandings
 
-# Turns HTML into a PDF for a tournament
-from utils.renderToPDF import renderToPDF
+# Returns a tournament option that was shown to the organiser
+from .candidates import getCachedOption
+
+# Searches for teams using the full text index of team names
+from team.search import searchTeams
 
 # Imports forms and database tables
 from account import models as accountModels
@@ -33,47 +63,64 @@ def tournament(request, pk):
     # The tournament the user is trying to get information on
     tournamentSelected = get_object_or_404(models.Tournament, pk = pk)
 
+    # Stores whether the user is a tournament organiser
+    userIsOrganiser = isOrganiser(request, tournamentSelected)
+
+    # Once a layout has been chosen the page only changes when the schedule does, so a browser with the latest copy is told to use it
+    # The page is different for each user, so the user is part of its ETag and it is only checked by its ETag
+    validators = None
+    if models.Game.objects.filter(tournament = tournamentSelected).exists() == True:
+        validators = getValidators(tournamentSelected, request.user.pk, userIsOrganiser, perUser = True)
+        notModified = getNotModified(request, validators)
+        if notModified is not None:
+            return notModified
+
     # numOfOrganisers is intiailly set to 0
     numOfOrganisers = 0
 
     # Empty list is created for organising teams to be added to
     organiserTeams = []
 
+    # The enrollments and invites for the tournament, with their teams loaded in the same query
+    enrollments = list(tournamentSelected.enrollment_set.select_related("team"))
+    invites = list(tournamentSelected.invite_set.select_related("team"))
+
     # numOfOrganisers is calculated by looking at each enrollment for the tournament
-    for enrollment in tournamentSelected.enrollment_set.all():
+    for enrollment in enrollments:
         if enrollment.organiser == True:
             numOfOrganisers += 1
 
-    # The user making the request
-    user = models.User.objects.get(id = request.user.id)
-
-    # Stores whether the user is a tournament organiser
-    userIsOrganiser = isOrganiser(user, tournamentSelected)
-
-    # games holds the list of games taking place in the tournament
-    games = models.Game.objects.none()
-    for timeslot in tournamentSelected.timeslot_set.all():
-        for pitch in timeslot.pitchinstance_set.all():
-            games = games | pitch.game_set.all()
+    # The timeslots in the tournament with their pitches and games, which is empty if a tournament layout has not been chosen
+    timeslots = loadSchedule(tournamentSelected)
+    hasLayout = len(timeslots) > 0
 
     # hasScores is initially assumed to be false
     hasScores = False
 
     # If a tournament layout has been chosen
-    if len(games) > 0:
+    if hasLayout == True:
         # If there is a score for the first game there will be scores for all games
-        if games[0].team1Score != None:
+        if timeslots[0].pitchinstance_set.all()[0].game_set.all()[0].team1Score != None:
             # Therefore hasScores must be true
             hasScores = True
 
     # Returns the HTML page with tournament information
-    return render(request, "tournament/tournament.html", {
+    response = render(request, "tournament/tournament.html", {
         "tournament": tournamentSelected,
+        "enrollments": enrollments,
+        "invites": invites,
+        "timeslots": timeslots,
+        "hasLayout": hasLayout,
         "numOfOrganisers": numOfOrganisers,
         "userIsOrganiser": userIsOrganiser,
         "hasScores": hasScores
     })
 
+    if validators is not None:
+        setValidators(response, validators)
+
+    return response
+
 # Provides the user with a list of tournaments their teams are competing in
 def tournamentList(request):
     # The user making the request
@@ -81,36 +128,30 @@ def tournamentList(request):
     # The tournaments the user is partaking in
     tournaments = user.getTournaments()
 
-    # Empty lists for upcoming and past tournaments to be added to to separate them
-    upcoming = []
-    past = []
+    # The current date
+    currentDate = datetime.now().date()
 
-    # If the user has competed/is going to compete in tournaments
-    if len(tournaments) != 0:
-        # Each tournament is put in a sublist with its start time
-        tournamentsWithTimestamps = [[(datetime.combine(tournament.startDate, datetime.min.time()).timestamp(), tournament)] for tournament in tournaments]
+    # Where each list starts, so the user can move through the lists a page at a time
+    upcomingCursor = request.GET.get("upcoming") or None
+    pastCursor = request.GET.get("past") or None
 
-        # Sorts the tournaments most recent first
-        mostRecentFirst = quickSort(tournamentsWithTimestamps)
-        # Takes each tournament out of the tuple it is in with its start time
-        tournamentsOrganised = [tournament[0][1] for tournament in mostRecentFirst]
-
-        # The current date at midnight
-        currentDate = datetime.now()
-        currentDateMidnight = datetime(currentDate.year, currentDate.month, currentDate.day, 0, 0)
-
-        for tournament in tournamentsOrganised:
-            # If tournament is after start of current day add to upcoming
-            if datetime.combine(tournament.startDate, datetime.min.time()) >= currentDateMidnight:
-                upcoming.append(tournament)
-            # Otherwise add to past
-            else:
-                past.append(tournament)
+    try:
+        # Tournaments on or after the current day are upcoming, and tournaments before are past
+        (upcoming, upcomingNext) = getPage(tournaments.filter(startDate__gte = currentDate), upcomingCursor)
+        (past, pastNext) = getPage(tournaments.filter(startDate__lt = currentDate), pastCursor)
+    # If the page requested is not valid
+    except ValueError:
+        raise Http404
 
     # Returns the HTML page with list of tournaments
     return render(request, "tournament/tournamentList.html", {
+        "hasTournaments": upcomingCursor is not None or pastCursor is not None or len(upcoming) + len(past) != 0,
         "tournamentsUpcoming": upcoming,
-        "tournamentsPast": past
+        "tournamentsPast": past,
+        "upcomingCursor": upcomingCursor or "",
+        "pastCursor": pastCursor or "",
+        "upcomingNext": upcomingNext,
+        "pastNext": pastNext
     })
 
 # Search for teams to add to a tournament
@@ -120,13 +161,11 @@ def addTeamsToTournament(request, pk):
     # Matches will be added to this list
     allMatches = []
 
-    # The user searching
-    user = models.User.objects.get(id = request.user.id)
     # The tournament the user is attempting to add teams to
     tournamentSelected = get_object_or_404(models.Tournament, pk = pk)
 
     # If the user is a tournament organiser and the layout hasn't already been decided
-    if isOrganiser(user, tournamentSelected) == True and tournamentSelected.timeslot_set.count() == 0:
+    if isOrganiser(request, tournamentSelected) == True and tournamentSelected.timeslot_set.count() == 0:
 
             # The search form
             inviteSearchForm = forms.InviteSearchForm()
@@ -139,19 +178,13 @@ def addTeamsToTournament(request, pk):
                 # If the form is valid
                 if form.is_valid():
 
-                    # Search query is split into its individual words and common terms such as RFC are removed
-                    team = form.cleaned_data.get("team")
-                    teamSplit = team.split(" ")
-                    teamSplitFiltered = [i for i in teamSplit if i != "RFC" and i != "Rugby" and i != "Club" and i != "Team"]
-
-                    # For each word in the query
-                    for keyWord in teamSplitFiltered:
-                        # Teams in the db which contain this word are retrieved
-                        matches = models.Team.objects.filter(name__icontains = keyWord)
-                        for match in matches:
-                            # If the team is not already a match and not already invited/competing in the tournament it is added as a match
-                            if match not in allMatches and match not in tournamentSelected.getTeamsInvited() and match not in tournamentSelected.getTeamsJoined():
-                                allMatches.append(match)
+                    # The teams matching the search, best match first
+                    # Teams already invited to or competing in the tournament are not included
+                    allMatches = searchTeams(
+                        form.cleaned_data.get("team"),
+                        models.Invite.objects.filter(tournament = tournamentSelected).values("team"),
+                        models.Enrollment.objects.filter(tournament = tournamentSelected).values("team")
+                    )
 
                     # Searched is now set to true so search results will appear on the web page
                     searched = True
@@ -166,15 +199,13 @@ def addTeamsToTournament(request, pk):
 
 # Adds an invitation to the database when a team is invited to join a tournament
 def inviteTeam(request, tournament_pk, team_pk):
-    # The user inviting the team
-    user = models.User.objects.get(id = request.user.id)
     # The tournament the team is being inivted to
     tournamentSelected = get_object_or_404(models.Tournament, pk = tournament_pk)
     # The team being invited
     teamSelected = get_object_or_404(models.Team, pk = team_pk)
 
     # If the user inviting is a tournament organiser, and the team being invited is not already invited and not already competing
-    if isOrganiser(user, tournamentSelected) == True and teamSelected not in tournamentSelected.getTeamsInvited() and teamSelected not in tournamentSelected.getTeamsJoined():
+    if isOrganiser(request, tournamentSelected) == True and teamSelected not in tournamentSelected.getTeamsInvited() and teamSelected not in tournamentSelected.getTeamsJoined():
         # The invite is added to the database
         addInvite = models.Invite.objects.create(team = teamSelected, tournament = tournamentSelected)
 
@@ -183,13 +214,11 @@ def inviteTeam(request, tournament_pk, team_pk):
 
 # Removes an enrollment from the database so a team is no longer competing in a tournament
 def removeTeamFromTournament(request, tournament_pk, enrollment_pk):
-    # The user removing the team from the tournament
-    user = models.User.objects.get(id = request.user.id)
     # The enrollment which is to be deleted
     enrollmentSelected = get_object_or_404(models.Enrollment, pk = enrollment_pk)
 
     # If the user is a tournament organiser and the layout hasn't already been decided
-    if isOrganiser(user, enrollmentSelected.tournament) == True and enrollmentSelected.tournament.timeslot_set.count() == 0:
+    if isOrganiser(request, enrollmentSelected.tournament) == True and enrollmentSelected.tournament.timeslot_set.count() == 0:
         # The enrollment is deleted from the database, removing the team from the tournament
         enrollmentSelected.delete()
         # Returns HTML page with tournament info
@@ -197,13 +226,11 @@ def removeTeamFromTournament(request, tournament_pk, enrollment_pk):
 
 # Removes an invitation from the database so a team is no longer invited to a tournament
 def removeInvite(request, tournament_pk, invite_pk):
-    # The user removing the invite
-    user = models.User.objects.get(id = request.user.id)
     # The invite which is to be deleted
     inviteSelected = get_object_or_404(models.Invite, pk = invite_pk)
 
     # If the user is a tournament organiser
-    if isOrganiser(user, inviteSelected.tournament) == True:
+    if isOrganiser(request, inviteSelected.tournament) == True:
         # The invite is deleted from the database, uninviting the team
         inviteSelected.delete()
 
@@ -243,13 +270,11 @@ def createTournament(request):
 
 # Provides a form used to edit a tournament
 def editTournament(request, pk):
-    # The user editing the tournament
-    user = models.User.objects.get(id = request.user.id)
     # The tournament being edited
     tournamentSelected = get_object_or_404(models.Tournament, pk = pk)
 
     # If the user attempting to edit the tournament is a tournament organiser and the layout hasn't yet been decided
-    if isOrganiser(user, tournamentSelected) == True and tournamentSelected.timeslot_set.count() == 0:
+    if isOrganiser(request, tournamentSelected) == True and tournamentSelected.timeslot_set.count() == 0:
         # The form with the tournament info already filled in
         form = forms.TournamentForm(request.POST or None, instance = tournamentSelected)
 
@@ -272,13 +297,11 @@ def editTournament(request, pk):
 
 # Removes a tournament from the database
 def deleteTournament(request, pk):
-    # The user attempting to delete the tournament
-    user = models.User.objects.get(id = request.user.id)
     # The tournament the user is attempting to delete
     tournamentSelected = get_object_or_404(models.Tournament, pk = pk)
 
     # If the user is a tournament organiser the tournament is deleted from the database
-    if isOrganiser(user, tournamentSelected) == True:
+    if isOrganiser(request, tournamentSelected) == True:
         tournamentSelected.delete()
 
         # User is redirected to the tournaments list
@@ -286,66 +309,56 @@ def deleteTournament(request, pk):
 
 # Adds the games for the appropriate tournament layout to the database
 def chooseTournament(request, pk, num):
-    # The user attempting to choose a layout
-    user = models.User.objects.get(id = request.user.id)
     # The tournament a user is attempting to choose a layout for
     tournamentSelected = get_object_or_404(models.Tournament, pk = pk)
 
     # If the user is a tournament organiser
-    if isOrganiser(user, tournamentSelected) == True:
+    if isOrganiser(request, tournamentSelected) == True:
         # The teams partaking in the tournament
         teams = [enrollment.team for enrollment in tournamentSelected.enrollment_set.all()]
         # All invites are deleted as teams cannot join tournament once layout is decided
         invites  = tournamentSelected.invite_set.all().delete()
 
-        # Holds the list of potential tournament layouts
-        tournaments = organise(teams, tournamentSelected.pitches, tournamentSelected.halfDuration, tournamentSelected.halfTimeDuration, tournamentSelected.swapTeamsDuration, tournamentSelected.startTime.hour, tournamentSelected.startTime.minute)
+        # The layout the user selected, exactly as it was shown to them if the teams and settings have not changed since
+        tournament = getCachedOption(tournamentSelected, teams, num)
 
-        # The layout the user selected
-        tournament = tournaments[num - 1]
+        # If the layout is not stored it is built without building any of the other layouts
+        if tournament is None:
+            tournament = getTournament(teams, tournamentSelected.pitches, tournamentSelected.halfDuration, tournamentSelected.halfTimeDuration, tournamentSelected.swapTeamsDuration, tournamentSelected.startTime.hour, tournamentSelected.startTime.minute, num, tournamentSelected.minGroupSize, tournamentSelected.maxGroupSize)
 
-        # For each timeslot in the tournament
-        for i in range(tournament.getNumOfTimeslots()):
-            # The timeslot is added to the database
-            timeslot = models.Timeslot(number = i + 1, tournament = tournamentSelected)
-            timeslot.save()
+        # If there is no layout with that number
+        if tournament is None:
+            raise Http404
 
-            # For each pitch in the timeslot
-            for j in range(tournament.timeslot(i).getNumOfPitches()):
-                # The pitch is added to the database
-                pitch = models.PitchInstance(name = j + 1, timeslot = timeslot)
-                pitch.save()
+        # The timeslots, pitches and games are added to the database, and browsers are told the schedule has changed
+        with transaction.atomic():
+            # The tournament is locked, so a layout cannot be added twice if the user chooses again before the first has been added
+            models.Tournament.objects.select_for_update().get(pk = tournamentSelected.pk)
 
-                # For each game on the pitch
-                for k in range(tournament.timeslot(i).pitch(j).getNumOfGames()):
-                    # The teams in the game
-                    (team1, team2) = tournament.timeslot(i).pitch(j).game(k).getGame()
-
-                    # If either team is a bye team it is assigned the BYE team record in the team database
-                    if team1 == "BYE":
-                        team1 = teamModels.Team.objects.get(id = 1)
-                    elif team2 == "BYE":
-                        team2 = teamModels.Team.objects.get(id = 1)
+            # If a layout has already been chosen, such as from a page which was out of date, the user is shown it instead
+            if tournamentSelected.timeslot_set.exists() == True:
+                return HttpResponseRedirect(tournamentSelected.get_absolute_url())
 
-                    # Tne game is added to the database
-                    game = models.Game(team1 = team1, team2 = team2, startTime = tournament.timeslot(i).pitch(j).game(k).getStartTime(), pitch = pitch)
-                    game.save()
+            commitSchedule(tournamentSelected, tournament)
+            bumpScheduleVersion(tournamentSelected, layoutChanged = True)
 
         # Returns the URL of the HTML page with tournament info
         return HttpResponseRedirect(tournamentSelected.get_absolute_url())
 
 # Enables user to select a new tournament layout
 def changeLayout(request, pk):
-    # The user attempting to change the layout
-    user = models.User.objects.get(id = request.user.id)
     # The tournament the user is attempting to change the layout of
     tournamentSelected = get_object_or_404(models.Tournament, pk = pk)
 
     # If the user is an organiser
-    if isOrganiser(user, tournamentSelected) == True:
-        # Delete each timeslot in the tournament - will also delete every pitch and game
-        for timeslot in tournamentSelected.timeslot_set.all():
-            timeslot.delete()
+    if isOrganiser(request, tournamentSelected) == True:
+        with transaction.atomic():
+            # Delete each timeslot in the tournament - will also delete every pitch and game
+            for timeslot in tournamentSelected.timeslot_set.all():
+                timeslot.delete()
+
+            # Browsers are told the schedule has changed
+            bumpScheduleVersion(tournamentSelected, layoutChanged = True)
 
         # Returns the URL of the HTML page with tournament info
         return HttpResponseRedirect(tournamentSelected.get_absolute_url())
@@ -355,29 +368,115 @@ def exportAsPDF(request, pk):
     # The tournament the user is attempting to view as a PDF
     tournamentSelected = get_object_or_404(models.Tournament, pk = pk)
 
-    # If the tournament layout has been chosen
-    if tournamentSelected.timeslot_set.count() != 0:
-        # Makes the tournament layout a PDF format
-        pdf = renderToPDF(tournamentSelected)
-        # Returns a pdf file to view in web browser
-        return HttpResponse(pdf, content_type='application/pdf')
+    # If the browser already has the PDF for the current schedule it is told to use it
+    validators = getValidators(tournamentSelected)
+    notModified = getNotModified(request, validators)
+    if notModified is not None:
+        return notModified
+
+    # If the tournament layout has not been chosen there is nothing to put in a PDF
+    if models.Game.objects.filter(tournament = tournamentSelected).exists() == False:
+        return HttpResponseRedirect(reverse("tournament:tournament", args = (pk,)))
+
+    # The PDF for the current layout, which is added to the queue for the background worker if it has not been made yet
+    export = requestPDF(tournamentSelected)
+
+    # If the PDF has not been made yet the user is asked to try again shortly
+    if export.status != models.PDFExport.DONE:
+        return render(request, "tournament/PDFPending.html", {
+            "tournament": tournamentSelected
+        }, status = 202)
+
+    # Returns the stored pdf file to view in web browser
+    # The ETag is only sent once the PDF has been made, so a browser never keeps the page asking the user to try again
+    response = HttpResponse(bytes(export.pdf), content_type='application/pdf')
+    return setValidators(response, validators)
+
+# Provides the user with the fixtures of a tournament as a CSV file
+def exportAsCSV(request, pk):
+    tournamentSelected = get_object_or_404(models.Tournament, pk = pk)
+
+    # If the browser already has the fixtures for the current schedule it is told to use them
+    validators = getValidators(tournamentSelected)
+    notModified = getNotModified(request, validators)
+    if notModified is not None:
+        return notModified
+
+    response = StreamingHttpResponse(streamCSV(tournamentSelected), content_type = "text/csv")
+    response["Content-Disposition"] = 'attachment; filename="tournament-{}.csv"'.format(pk)
+    return setValidators(response, validators)
+
+# Provides the user with the fixtures of a tournament as JSON
+def exportAsJSON(request, pk):
+    tournamentSelected = get_object_or_404(models.Tournament, pk = pk)
+
+    # If the browser already has the fixtures for the current schedule it is told to use them
+    validators = getValidators(tournamentSelected)
+    notModified = getNotModified(request, validators)
+    if notModified is not None:
+        return notModified
+
+    response = StreamingHttpResponse(streamJSON(tournamentSelected), content_type = "application/json")
+    return setValidators(response, validators)
+
+# Provides the user with the games of a team in a tournament as an iCalendar file, which can be added to a calendar
+def exportAsCalendar(request, tournament_pk, team_pk):
+    # The team must be competing in the tournament
+    enrollment = get_object_or_404(models.Enrollment.objects.select_related("tournament", "team"), tournament_id = tournament_pk, team_id = team_pk)
+
+    # If the browser already has the calendar for the current schedule it is told to use it
+    validators = getValidators(enrollment.tournament)
+    notModified = getNotModified(request, validators)
+    if notModified is not None:
+        return notModified
+
+    response = StreamingHttpResponse(streamCalendar(enrollment.tournament, enrollment.team), content_type = "text/calendar")
+    response["Content-Disposition"] = 'attachment; filename="tournament-{}-team-{}.ics"'.format(tournament_pk, team_pk)
+    return setValidators(response, validators)
+
+# Provides clients with the games of a tournament whose scores have changed since the version they last saw, as JSON
+# If there are no new scores and the client asks to wait, it is kept waiting until there are, or until the timeout given in seconds has passed
+# When the site is served through ASGI this is answered by scoreFeedApplication instead, so waiting clients do not hold a thread
+def scoreFeed(request, pk):
+    tournamentSelected = get_object_or_404(models.Tournament, pk = pk)
+
+    try:
+        # The version the client last saw and how long it is willing to wait for new scores
+        # The client is answered straight away unless it asks to wait, as a waiting client holds a whole thread here
+        (since, timeout) = parseFeedQuery(request.GET, 0, SYNC_POLL_TIMEOUT)
+    # If the version or timeout are not numbers
+    except ValueError:
+        raise Http404
+
+    # If the client already has the latest scores it waits for new ones
+    if since is not None and since >= tournamentSelected.scheduleVersion:
+        waitForChange(tournamentSelected, since, timeout)
+
+    return JsonResponse(getScoreFeed(tournamentSelected, since))
+
+# Provides the user with the standings of each group in a tournament
+def standings(request, pk):
+    # The tournament the user is trying to get the standings of
+    tournamentSelected = get_object_or_404(models.Tournament, pk = pk)
+
+    # Returns the HTML page with the standings for each group
+    return render(request, "tournament/standings.html", {
+        "tournament": tournamentSelected,
+        "groups": loadStandings(tournamentSelected)
+    })
 
 # Provides the user with a form to add results and adds these results to the database
 def addResults(request, pk):
-    # The user attempting to add the results
-    user = models.User.objects.get(id = request.user.id)
     # The tournament the user is attempting to add the results to
     tournamentSelected = get_object_or_404(models.Tournament, pk = pk)
 
     # If the user is a tournament organiser
-    if isOrganiser(user, tournamentSelected) == True:
-        # games holds each game taking place in the tournament
-        games = models.Game.objects.none()
-        for timeslot in tournamentSelected.timeslot_set.all():
-            for pitch in timeslot.pitchinstance_set.all():
-                games = games | pitch.game_set.all()
+    if isOrganiser(request, tournamentSelected) == True:
+        # games holds each game taking place in the tournament, in the order they were added
+        games = loadGames(tournamentSelected)
 
         # Holds teams partaking in the tourname in order they appear in games
+        # This loads the games, so the forms below use the games already loaded rather than loading them again
         teamsInGamesOrder = []
         for game in games:
             teamsInGamesOrder.append([game.team1, game.team2])
@@ -387,13 +486,25 @@ def addResults(request, pk):
 
         # If the request is an HTML POST request
         if request.method == "POST":
-            # Form with fields filled in with new inputs
-            form = forms.GameFormSet(request.POST)
+            # Form with fields filled in with new inputs, which can only change the games in the tournament
+            form = forms.GameFormSet(request.POST, queryset = games)
 
             # If the form is valid
             if form.is_valid():
-                # Save the updated scores to the database
-                form.save()
+                # The old and new scores of each game whose scores have changed
+                changes = [
+                    (gameForm.instance, (gameForm.initial.get("team1Score"), gameForm.initial.get("team2Score")), (gameForm.cleaned_data["team1Score"], gameForm.cleaned_data["team2Score"]))
+                    for gameForm in form.forms if gameForm.has_changed() == True
+                ]
+
+                # Save the updated scores to the database, and update the standings for only the games that changed
+                # If any scores changed, browsers are told the schedule has changed, and the games are marked as changed in the new version
+                with transaction.atomic():
+                    form.save()
+                    applyResults(changes)
+                    if len(changes) != 0:
+                        bumpScheduleVersion(tournamentSelected)
+                        models.Game.objects.filter(pk__in = [game.pk for (game, oldScores, newScores) in changes]).update(scoreVersion = tournamentSelected.scheduleVersion)
 
                 # Return the URL of the HTML page with tournament info
                 return HttpResponseRedirect(tournamentSelected.get_absolute_url())
@@ -404,25 +515,3 @@ def addResults(request, pk):
             "gamesWithFormset": zip(list(teamsInGamesOrder), gameFormSet),
             "formset": gameFormSet
         })
-
-# Determines whether a user is a tournament organiser and therefore has permission to perform certain tasks
-def isOrganiser(user, tournamentSelected):
-    # Will hold the teams the user is an organiser of
-    organiserTeams = []
-
-    # For each enrollment the user has in the database
-    for enrollment in tournamentSelected.enrollment_set.all():
-        # If the user is set as an organiser of that enrollment add the team to the organiserTeams list
-        if enrollment.organiser == True:
-            organiserTeams.append(enrollment.team.pk)
-
-    # userIsOrganiser is initially assumed to be false
-    userIsOrganiser = False
-
-    # For each team the user is a member of, if that team is an organiser team and the user is a team administator of that team, then they are an organiser
-    for membership in user.membership_set.all():
-        if membership.administrator == True:
-            if membership.team.pk in organiserTeams:
-                userIsOrganiser = True
-
-    return userIsOrganiser
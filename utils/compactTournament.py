@@ -0,0 +1,300 @@
+# array stores the layout as machine integers rather than as lists of Python objects
+from array import array
+
+# datetime allows dates to be stored in python
+# timedelta enables dates to be updated by a certain number of days etc.
+from datetime import timedelta
+
+# Calculates the games on a pitch directly from round and slot indexes
+from utils.roundRobin import calcNumOfGames, fillPairings
+
+# The shape of a tournament layout, which does not depend on which teams are playing or when the tournament starts
+# It holds flat parallel arrays indexed by group (a pitch within a timeslot) and by game, with teams referred to by their index within their group
+class LayoutShape:
+    __slots__ = (
+        "number", "gameDuration", "duration",
+        "timeslotGroups", "groupSizes", "groupHasBye", "groupTeams", "groupGames",
+        "team1s", "team2s", "startMinutes"
+    )
+
+    def __init__(self, number, groupSizes, groupHasBye, timeslotGroups, gameDuration):
+        # The position of the layout in the order the layouts are generated in, starting at 1
+        self.number = number
+
+        # The duration of a game in minutes
+        self.gameDuration = gameDuration
+
+        # The number of real teams in each group, and whether each group needs a bye team
+        self.groupSizes = groupSizes
+        self.groupHasBye = groupHasBye
+
+        # The index of the first group in each timeslot, followed by the total number of groups
+        self.timeslotGroups = timeslotGroups
+
+        # The index of the first team in each group, followed by the total number of teams
+        self.groupTeams = array("i", [0])
+        for size in groupSizes:
+            self.groupTeams.append(self.groupTeams[-1] + size)
+
+        # The index of the first game in each group, followed by the total number of games
+        self.groupGames = array("i", [0])
+        for group in range(len(groupSizes)):
+            self.groupGames.append(self.groupGames[-1] + calcNumOfGames(groupSizes[group] + groupHasBye[group]))
+
+        # The games are only calculated when they are first accessed
+        self.team1s = None
+        self.team2s = None
+        self.startMinutes = None
+
+        self.calculateDuration()
+
+    # Returns the number of timeslots
+    def getNumOfTimeslots(self):
+        return len(self.timeslotGroups) - 1
+
+    # Returns the number of games on a group
+    def getNumOfGames(self, group):
+        return self.groupGames[group + 1] - self.groupGames[group]
+
+    # Returns the number of bye games on a group
+    def getNumOfByeGames(self, group):
+        # Bye team must play every other team, so a group with a bye has as many bye games as real teams
+        if self.groupHasBye[group] == True:
+            return self.groupSizes[group]
+        else:
+            return 0
+
+    # Calculates the duration of the tournament in minutes from the number of games on the first pitch of each timeslot, without calculating any games
+    def calculateDuration(self):
+        timeslotStartMinute = 0
+
+        # Each timeslot starts after every game on the first pitch of the previous timeslot, including bye games
+        for timeslot in range(self.getNumOfTimeslots() - 1):
+            timeslotStartMinute += self.gameDuration * self.getNumOfGames(self.timeslotGroups[timeslot])
+
+        # The last game on a pitch starts at the same time as its last non-bye game, whether or not it is a bye game
+        # So the duration is the start of the last timeslot plus the time taken to play each non-bye game on its first pitch
+        lastGroup = self.timeslotGroups[-2]
+        self.duration = timeslotStartMinute + self.gameDuration * (self.getNumOfGames(lastGroup) - self.getNumOfByeGames(lastGroup))
+
+    # Returns a fingerprint which is the same for any two layouts that only differ in the order of the pitches within a timeslot
+    # It is the sorted size of each group in each timeslot along with whether the group needs a bye team
+    def getFingerprint(self):
+        return tuple(
+            tuple(sorted((self.groupSizes[group], self.groupHasBye[group] == True) for group in range(self.timeslotGroups[timeslot], self.timeslotGroups[timeslot + 1])))
+            for timeslot in range(self.getNumOfTimeslots())
+        )
+
+    # Returns whether the games have been calculated yet
+    def hasGames(self):
+        return self.startMinutes is not None
+
+    # Calculates the games for every group if they have not been calculated already
+    def getGames(self):
+        if self.hasGames() == False:
+            self.calculateGames()
+
+    # Calculates the games for every group and stores them in flat arrays
+    # Shapes are shared between requests, so the arrays are only stored once they are complete
+    def calculateGames(self):
+        gameDuration = self.gameDuration
+
+        numOfGames = self.groupGames[-1]
+        # The index of each team within its group, and the start time of each game in minutes after the tournament starts
+        team1s = array("i", bytes(numOfGames * array("i").itemsize))
+        team2s = array("i", bytes(numOfGames * array("i").itemsize))
+        startMinutes = array("i", bytes(numOfGames * array("i").itemsize))
+
+        timeslotStartMinute = 0
+        for timeslot in range(self.getNumOfTimeslots()):
+            for group in range(self.timeslotGroups[timeslot], self.timeslotGroups[timeslot + 1]):
+                start = self.groupGames[group]
+                end = fillPairings(self.groupSizes[group] + self.groupHasBye[group], team1s, team2s, start)
+
+                # The bye team is always the last team in the group, so has the same index as the number of real teams
+                byeIndex = self.groupSizes[group] if self.groupHasBye[group] == True else -1
+
+                gameMinute = timeslotStartMinute
+                for k in range(start, end):
+                    # If the game is a bye game then the game start time is the same as the previous game
+                    if team1s[k] == byeIndex or team2s[k] == byeIndex:
+                        startMinutes[k] = gameMinute - gameDuration
+                    # If the game is not a bye game then the start time is incremented
+                    else:
+                        startMinutes[k] = gameMinute
+                        gameMinute += gameDuration
+
+            # Increase the timeslot start time by the number of games on the first pitch so start time is correct for games in the next timeslot
+            timeslotStartMinute += gameDuration * self.getNumOfGames(self.timeslotGroups[timeslot])
+
+        self.setGames(team1s, team2s, startMinutes)
+
+    # Stores games which have already been calculated, for example by another process
+    def setGames(self, team1s, team2s, startMinutes):
+        self.team1s = team1s
+        self.team2s = team2s
+        self.startMinutes = startMinutes
+
+# Compact alternative to organise.Tournament with the same accessor API
+# The teams and start time are bound onto a layout shape, which may be shared with other tournaments
+# Timeslot, pitch, team and game objects are only created as lightweight views when they are accessed
+class CompactTournament:
+    __slots__ = ("shape", "teams", "startTime")
+
+    def __init__(self, shape, teams, startTime):
+        self.shape = shape
+        # Team i in the shape is teams[i]
+        self.teams = teams
+        self.startTime = startTime
+
+    # Calculates the games for every group if they have not been calculated already
+    def getGames(self):
+        self.shape.getGames()
+
+    # Returns whether the games have been calculated yet
+    def hasGames(self):
+        return self.shape.hasGames()
+
+    # Returns specified timeslot object
+    def timeslot(self, timeslot):
+        return CompactTimeslot(self, timeslot)
+
+    # Returns the number of timeslots
+    def getNumOfTimeslots(self):
+        return self.shape.getNumOfTimeslots()
+
+    # Returns the position of the layout in the order the layouts are generated in, starting at 1
+    def getNumber(self):
+        return self.shape.number
+
+    # Returns a fingerprint which is the same for any two layouts that only differ in the order of the pitches within a timeslot
+    def getFingerprint(self):
+        return self.shape.getFingerprint()
+
+    # Returns the duration of the tournament
+    def getDuration(self):
+        return timedelta(minutes = self.shape.duration)
+
+    # Returns the number of bye games in the tournament
+    def getNumOfByeGames(self):
+        return sum(self.shape.getNumOfByeGames(group) for group in range(len(self.shape.groupSizes)))
+
+    # Returns the number of non bye games in the tournament
+    def getNumOfNonByeGames(self):
+        return self.shape.groupGames[-1] - self.getNumOfByeGames()
+
+class CompactTimeslot:
+    __slots__ = ("tournament", "index")
+
+    def __init__(self, tournament, index):
+        self.tournament = tournament
+        self.index = index
+
+    # Returns specified pitch object
+    def pitch(self, pitch):
+        return CompactPitch(self.tournament, self.tournament.shape.timeslotGroups[self.index] + pitch)
+
+    # Returns the number of pitches used within the timeslot
+    def getNumOfPitches(self):
+        return self.tournament.shape.timeslotGroups[self.index + 1] - self.tournament.shape.timeslotGroups[self.index]
+
+    # Returns the number of bye games within the timeslot
+    def getNumOfByeGames(self):
+        return sum(self.pitch(i).getNumOfByeGames() for i in range(self.getNumOfPitches()))
+
+    # Returns the number of non bye games within the timeslot
+    def getNumOfNonByeGames(self):
+        return sum(self.pitch(i).getNumOfNonByeGames() for i in range(self.getNumOfPitches()))
+
+class CompactPitch:
+    __slots__ = ("tournament", "group")
+
+    def __init__(self, tournament, group):
+        self.tournament = tournament
+        self.group = group
+
+    # Returns specified team object
+    def team(self, team):
+        return CompactTeam(self.tournament, self.group, team)
+
+    # Returns the number of teams playing on the pitch, including the bye team
+    def getNumOfTeams(self):
+        return self.tournament.shape.groupSizes[self.group] + self.tournament.shape.groupHasBye[self.group]
+
+    # Returns specified game object
+    def game(self, game):
+        return CompactGame(self.tournament, self.group, self.tournament.shape.groupGames[self.group] + game)
+
+    # Returns the number of games on the pitch
+    def getNumOfGames(self):
+        return self.tournament.shape.getNumOfGames(self.group)
+
+    # Returns whether the pitch needs a bye team
+    def doesPitchNeedBye(self):
+        return self.tournament.shape.groupHasBye[self.group] == True
+
+    # Returns the number of bye games
+    def getNumOfByeGames(self):
+        return self.tournament.shape.getNumOfByeGames(self.group)
+
+    # Returns the number of non-bye games
+    def getNumOfNonByeGames(self):
+        return self.getNumOfGames() - self.getNumOfByeGames()
+
+class CompactTeam:
+    __slots__ = ("tournament", "group", "index")
+
+    def __init__(self, tournament, group, index):
+        self.tournament = tournament
+        self.group = group
+        self.index = index
+
+    # Returns the team, or "BYE" if the team is the bye team
+    def getTeam(self):
+        if self.getIsBye() == True:
+            return "BYE"
+        else:
+            return self.tournament.teams[self.tournament.shape.groupTeams[self.group] + self.index]
+
+    # Returns whether the team is a bye team
+    def getIsBye(self):
+        return self.index == self.tournament.shape.groupSizes[self.group]
+
+class CompactGame:
+    __slots__ = ("tournament", "group", "index")
+
+    def __init__(self, tournament, group, index):
+        self.tournament = tournament
+        self.group = group
+        self.index = index
+
+    # Returns the two teams playing in the game
+    def getGame(self):
+        self.tournament.getGames()
+        return [
+            CompactTeam(self.tournament, self.group, self.tournament.shape.team1s[self.index]).getTeam(),
+            CompactTeam(self.tournament, self.group, self.tournament.shape.team2s[self.index]).getTeam()
+        ]
+
+    # Returns the start time of the game
+    def getStartTime(self):
+        self.tournament.getGames()
+        return self.tournament.startTime + timedelta(minutes = self.tournament.shape.startMinutes[self.index])
+
+# Creates the layout shape for a combo, where every timeslot other than the last has the maximum number of pitches
+def createLayoutShape(number, combo, numOfTimeslots, maxNumOfPitchesPerTimeslot, gameDuration):
+    # The maximum number of teams on a pitch for a combo is the number of teams on the first pitch
+    # Any pitch with fewer teams than this needs a bye team
+    groupSizes = array("i", combo)
+    groupHasBye = array("b", [size < combo[0] for size in combo])
+
+    # Every timeslot other than the last has the maximum number of pitches, and the last timeslot has the rest
+    timeslotGroups = array("i", [j * maxNumOfPitchesPerTimeslot for j in range(numOfTimeslots)])
+    timeslotGroups.append(len(combo))
+
+    return LayoutShape(number, groupSizes, groupHasBye, timeslotGroups, gameDuration)
+
+# Binds the teams and start time onto a layout shape
+# The list of teams is not copied, so every candidate for the same request can share it
+def bindTeams(shape, teams, startTime):
+    return CompactTournament(shape, teams, startTime)
@@ -2,12 +2,26 @@
 # timedelta enables dates to be updated by a certain number of days etc.
 from datetime import datetime, timedelta
 
-class Queue():
-    def __init__(self, aList):
-        self.queue = aList
+# islice allows a single candidate to be taken from a generator without building the candidates before it
+from itertools import islice
 
-    def deQueue(self):
-        return self.queue.pop(0)
+# perf_counter measures how long each stage of a search takes
+from time import perf_counter
+
+# Calculates the games on a pitch directly from round and slot indexes
+from utils.roundRobin import RoundRobin
+
+# Compact alternative to the tournament objects below, which stores each layout in flat arrays
+from utils.compactTournament import createLayoutShape, bindTeams
+
+# Least recently used cache of the layout shapes for each number of teams, number of pitches and game duration
+from utils.shapeCache import shapeCache
+
+# Calculates the games for many layouts at once, optionally using a pool of worker processes
+from utils import parallel
+
+# Scores layouts so only the best few are offered
+from utils import scoring
 
 class Tournament:
     def __init__(self):
@@ -253,148 +267,282 @@ def calculateGameDuration(halfDuration, halfTimeDuration, swapTeamsDuration):
 
     return gameDuration
 
+# The default smallest and largest number of teams that can play on a pitch in a timeslot
+MIN_GROUP_SIZE = 3
+MAX_GROUP_SIZE = 5
+
+# The number of layouts offered to the organiser
+NUM_OF_OPTIONS = 5
+
 # Returns the minimum number of timeslots needed for a tournament depending on the number of teams and number of pitches
-def calcNumOfTimeslots(numOfTeams, numOfPitches):
-    maxTeamsPerPitch = numOfTeams // numOfPitches
-    teamsRemaining = numOfTeams - (maxTeamsPerPitch * numOfPitches)
-
-    if teamsRemaining != 0:
-        maxTeamsPerPitch += 1
-
-    numOfTimeslots = 0
-
-    # 5 teams can fit on a pitch in a timeslot
-    # A new timeslot is needed if the no. of teams on a pitch exceeds a new multiple of 5
-    # Therefore the for loop below counts up from the max number of teams per pitch until it reaches a number in the sequence 5n + 1
-    # It then works out how many times it fits into the sequence, and this is the number of timeslots needed
-    for i in range(maxTeamsPerPitch + 1, maxTeamsPerPitch + 6):
-        if ((i - 1) / 5) % 1 == 0:
-            numOfTimeslots += int((i - 1) / 5)
-            break
+def calcNumOfTimeslots(numOfTeams, numOfPitches, maxGroupSize = MAX_GROUP_SIZE):
+    # The teams are spread as evenly as possible across the pitches, so the busiest pitch has this many teams rounded up
+    maxTeamsPerPitch = -(-numOfTeams // numOfPitches)
 
-    return numOfTimeslots
+    # maxGroupSize teams can fit on a pitch in a timeslot
+    # So the number of timeslots needed is the number of teams on the busiest pitch divided by maxGroupSize, rounded up
+    return -(-maxTeamsPerPitch // maxGroupSize)
 
 # Returns the layout for each group for a given number of teams and groups
 def calcNumOfTeamsOnPitches(numOfTeams, numOfPitches):
-    # Initially spreads the number of teams evenly across the groups
+    # Spreads the number of teams evenly across the groups
+    # The remaining teams go one each to the first groups
     minTeamsPerPitch = numOfTeams // numOfPitches
     teamsRemaining = numOfTeams - (minTeamsPerPitch * numOfPitches)
-    numOfTeamsOnPitches = [minTeamsPerPitch] * numOfPitches
-
-    # Assigns the remaining teams to the groups, starting at the first group
-    i = 0
-    while teamsRemaining != 0:
-        numOfTeamsOnPitches[i] += 1
-        teamsRemaining -= 1
-        i += 1
 
-    return numOfTeamsOnPitches
+    return [minTeamsPerPitch + 1] * teamsRemaining + [minTeamsPerPitch] * (numOfPitches - teamsRemaining)
 
-# Calculates the possible tournament layouts for a given number of teams, pitches and timeslots
-def calcTeamsOnPitchesCombos(numOfTeams, numOfPitches, numOfTimeslots):
-    # Possible layouts will be added to this list
-    combos = []
-
-    # Each pitch within a timeslot is known as a group
-    numOfGroups = numOfPitches * numOfTimeslots
+# Returns whether spreading the teams evenly across the given number of groups gives a valid combo
+# Worked out from the smallest and largest group alone, without building the combo
+def isValidNumOfGroups(numOfTeams, numOfGroups, minGroupSize = MIN_GROUP_SIZE, maxGroupSize = MAX_GROUP_SIZE):
+    if numOfGroups < 1:
+        return False
 
-    # Finds all possible layouts for the given number of timeslots
-    for i in range(numOfTimeslots, numOfTimeslots + numOfPitches):
-        # Finds the combo for the number of teams and number of groups
-        combo = calcNumOfTeamsOnPitches(numOfTeams, numOfGroups)
+    # The smallest group has the number of teams divided by the number of groups, and the largest group has this rounded up
+    smallestGroup = numOfTeams // numOfGroups
+    largestGroup = -(-numOfTeams // numOfGroups)
 
-        # Assumes the combo to be valid
-        validCombo = True
+    # A group needs at least minGroupSize teams and can have at most maxGroupSize teams
+    return smallestGroup >= minGroupSize and largestGroup <= maxGroupSize
 
-        # For each group in the combo
-        for i in combo:
-            # If there is more than 5 teams in the group the combo isn't valid
-            if i > 5:
-                validCombo = False
-        # If there is 2 or 1 or 0 teams in a group the combo isn't valid
-        if 2 in combo or 1 in combo or 0 in combo:
-            validCombo = False
-
-        # If the combo is valid add it
-        if validCombo == True:
-            combos.append(combo)
-
-        # Reduce the number of groups by 1 to find other potential combos
-        numOfGroups -= 1
+# Calculates the possible tournament layouts for a given number of teams, pitches and timeslots
+def calcTeamsOnPitchesCombos(numOfTeams, numOfPitches, numOfTimeslots, minGroupSize = MIN_GROUP_SIZE, maxGroupSize = MAX_GROUP_SIZE):
+    # Each pitch within a timeslot is known as a group
+    # The possible layouts use between the maximum number of groups for the timeslots, and one more group than the timeslots before needed
+    maxNumOfGroups = numOfPitches * numOfTimeslots
 
-    return combos
+    return [calcNumOfTeamsOnPitches(numOfTeams, numOfGroups) for numOfGroups in range(maxNumOfGroups, maxNumOfGroups - numOfPitches, -1) if isValidNumOfGroups(numOfTeams, numOfGroups, minGroupSize, maxGroupSize)]
 
 # Creates the tournament objects for each combo provided
 def createPossibleTournaments(teams, combos, numOfTimeslots):
-    # Creates a queue of teams repeated for the number of combos needed to be implemented
-    # This is as each team will need to be dequeued in order to be assigned to a tournament
-    teams = Queue(teams.copy() * len(combos))
-
     # To hold each possible tournament for specific number of timeslots
     tournaments = []
 
-    combosDuplicate = []
-    for combo in combos:
-        combosDuplicate.append(combo.copy())
+    # The maximum number on a pitch in a timeslot is the number of times the given number of timeslots fits into the number of groups in the first combo, rounded up
+    maxNumOfPitchesPerTimeslot = -(-len(combos[0]) // numOfTimeslots)
 
     # For each tournament combo
-    for i in range(len(combos)):
-
-        # The maximum number of teams on a pitch for a combo is the number of teams on the first pitch
-        maxNumOfTeamsOnPitchInATimeslot = combosDuplicate[i][0]
-
-        # The maximum number on a pitch in a timeslot is the number of times the given number of timeslots fits into the number of groups in the combo
-        maxNumOfPitchesPerTimeslot = len(combos[0]) // numOfTimeslots
-        # Needs to be incremented by one if the number of timeslots does not perfectly fit into the number of groups in the first combo
-        if len(combos[0]) % numOfTimeslots != 0:
-            maxNumOfPitchesPerTimeslot += 1
+    for combo in combos:
+        # The maximum number of teams on a pitch for a combo is the number of teams on the first pitch
+        maxNumOfTeamsOnPitchInATimeslot = combo[0]
 
-        tournaments.append(Tournament())
+        tournament = Tournament()
+        tournaments.append(tournament)
 
-        numOfPitchesInLastTimeslot = len(combos[i]) - (numOfTimeslots - 1) * maxNumOfPitchesPerTimeslot
+        numOfPitchesInLastTimeslot = len(combo) - (numOfTimeslots - 1) * maxNumOfPitchesPerTimeslot
 
-        # Add a timeslot for each timeslot
-        for j in range(numOfTimeslots):
+        # Every timeslot other than the last has the maximum number of pitches
+        for j in range(numOfTimeslots - 1):
+            tournament.addTimeslot(maxNumOfPitchesPerTimeslot)
+        tournament.addTimeslot(numOfPitchesInLastTimeslot)
 
-            # If last timeslot to be added
-            if j == numOfTimeslots - 1:
-                tournaments[i].addTimeslot(numOfPitchesInLastTimeslot)
-            # If not the last timeslot to be added
-            else:
-                tournaments[i].addTimeslot(maxNumOfPitchesPerTimeslot)
+        # The index of the group being filled, and the index of the first team in the group
+        group = 0
+        firstTeam = 0
 
         # For each timeslot in the tournament just created
-        for j in range(tournaments[i].getNumOfTimeslots()):
+        for j in range(tournament.getNumOfTimeslots()):
 
             # For each pitch in the timeslot
-            for k in range(tournaments[i].timeslot(j).getNumOfPitches()):
-                numOfTeamsToBeAddedToPitch = combosDuplicate[i].pop(0)
+            for k in range(tournament.timeslot(j).getNumOfPitches()):
+                pitch = tournament.timeslot(j).pitch(k)
+                numOfTeamsToBeAddedToPitch = combo[group]
 
-                # For the number of teams which will play on the pitch
-                for l in range(numOfTeamsToBeAddedToPitch):
-                    tournaments[i].timeslot(j).pitch(k).addTeam(teams.deQueue())
+                # The teams playing on the pitch are the next teams in the list
+                for team in teams[firstTeam:firstTeam + numOfTeamsToBeAddedToPitch]:
+                    pitch.addTeam(team)
 
                 if numOfTeamsToBeAddedToPitch < maxNumOfTeamsOnPitchInATimeslot:
-                    tournaments[i].timeslot(j).pitch(k).needsBye()
+                    pitch.needsBye()
+
+                group += 1
+                firstTeam += numOfTeamsToBeAddedToPitch
 
     return tournaments
 
+# Yields each valid combo in the same order as main, along with the number of timeslots and the maximum number of pitches in a timeslot
+# Once there are no valid combos for a number of timeslots, there are none for more timeslots either, as the groups only get smaller
+def iterCombos(numOfTeams, numOfPitches, minGroupSize = MIN_GROUP_SIZE, maxGroupSize = MAX_GROUP_SIZE):
+    # Calculate the number of timeslots by inputting the number of teams and number of pitches
+    numOfTimeslots = calcNumOfTimeslots(numOfTeams, numOfPitches, maxGroupSize)
+
+    # Will loop until valid combos can no longer be produced
+    while True:
+        combos = calcTeamsOnPitchesCombos(numOfTeams, numOfPitches, numOfTimeslots, minGroupSize, maxGroupSize)
+
+        # If no valid combos were made then no more valid combos can be made
+        if combos == []:
+            return
+
+        # The maximum number of pitches in a timeslot is worked out from the first combo, as in createPossibleTournaments
+        maxNumOfPitchesPerTimeslot = -(-len(combos[0]) // numOfTimeslots)
+
+        for combo in combos:
+            yield combo, numOfTimeslots, maxNumOfPitchesPerTimeslot
+
+        numOfTimeslots += 1
+
+# Returns the layout shape for every valid combo, and whether every combo was found before the deadline
+# The shapes only depend on the number of teams, the number of pitches, the group sizes and the game duration in minutes
+# They are cached, so tournaments with the same settings share them rather than working them out again, but only once every combo has been found
+def searchShapes(numOfTeams, numOfPitches, gameDuration, minGroupSize = MIN_GROUP_SIZE, maxGroupSize = MAX_GROUP_SIZE, deadline = None):
+    key = (numOfTeams, numOfPitches, gameDuration, minGroupSize, maxGroupSize)
+    shapes = shapeCache.get(key)
+
+    if shapes is not None:
+        return shapes, True
+
+    shapes = []
+    for (number, (combo, numOfTimeslots, maxNumOfPitchesPerTimeslot)) in enumerate(iterCombos(numOfTeams, numOfPitches, minGroupSize, maxGroupSize), 1):
+        shapes.append(createLayoutShape(number, combo, numOfTimeslots, maxNumOfPitchesPerTimeslot, gameDuration))
+        # If the time has run out the shapes found so far are returned, which always includes at least one shape
+        if deadline is not None and deadline.hasPassed() == True:
+            return tuple(shapes), False
+
+    shapes = tuple(shapes)
+    shapeCache.put(key, shapes)
+
+    return shapes, True
+
+# Returns the layout shape for every valid combo
+def getShapes(numOfTeams, numOfPitches, gameDuration, minGroupSize = MIN_GROUP_SIZE, maxGroupSize = MAX_GROUP_SIZE):
+    return searchShapes(numOfTeams, numOfPitches, gameDuration, minGroupSize, maxGroupSize)[0]
+
+# Yields each possible tournament layout one at a time as a compact tournament
+# The games for a layout are only calculated when they are first accessed, so summaries such as the duration are cheap
+def iterTournaments(teams, numOfPitches, halfDuration, halfTimeDuration, swapTeamsDuration, startHour, startMinute, minGroupSize = MIN_GROUP_SIZE, maxGroupSize = MAX_GROUP_SIZE):
+    startTime = datetime(1970, 1, 1, startHour, startMinute)
+    gameDuration = calculateGameDuration(halfDuration, halfTimeDuration, swapTeamsDuration)
+
+    # The teams are copied once and shared by every layout, which refer to them by index
+    teams = list(teams)
+
+    for shape in getShapes(len(teams), numOfPitches, gameDuration, minGroupSize, maxGroupSize):
+        yield bindTeams(shape, teams, startTime)
+
+# Returns the best numOfOptions layouts as compact tournaments, best first
+# Every layout is scored from its shape alone, so only the games for the layouts returned are ever calculated
+# If timeBudget is given the best layouts found within that many seconds are returned, and the result records whether the search was complete
+def getBestTournaments(teams, numOfPitches, halfDuration, halfTimeDuration, swapTeamsDuration, startHour, startMinute, minGroupSize = MIN_GROUP_SIZE, maxGroupSize = MAX_GROUP_SIZE, numOfOptions = NUM_OF_OPTIONS, timeBudget = None):
+    return search(teams, numOfPitches, halfDuration, halfTimeDuration, swapTeamsDuration, startHour, startMinute, minGroupSize, maxGroupSize, numOfOptions, timeBudget)
+
+# Returns only the layout numbered num (starting at 1) as a compact tournament, or None if there is no such layout
+# If the shapes are not already cached, the combos before it are enumerated but no shape is built for them
+def getTournament(teams, numOfPitches, halfDuration, halfTimeDuration, swapTeamsDuration, startHour, startMinute, num, minGroupSize = MIN_GROUP_SIZE, maxGroupSize = MAX_GROUP_SIZE):
+    if num < 1:
+        return None
+
+    startTime = datetime(1970, 1, 1, startHour, startMinute)
+    gameDuration = calculateGameDuration(halfDuration, halfTimeDuration, swapTeamsDuration)
+    teams = list(teams)
+
+    # If the shapes are cached the layout can be taken straight from the cache
+    if shapeCache.contains((len(teams), numOfPitches, gameDuration, minGroupSize, maxGroupSize)):
+        shapes = getShapes(len(teams), numOfPitches, gameDuration, minGroupSize, maxGroupSize)
+        if num > len(shapes):
+            return None
+        return bindTeams(shapes[num - 1], teams, startTime)
+
+    selected = next(islice(iterCombos(len(teams), numOfPitches, minGroupSize, maxGroupSize), num - 1, None), None)
+    if selected is None:
+        return None
+
+    (combo, numOfTimeslots, maxNumOfPitchesPerTimeslot) = selected
+    return bindTeams(createLayoutShape(num, combo, numOfTimeslots, maxNumOfPitchesPerTimeslot, gameDuration), teams, startTime)
+
+# The point in time a search has to finish by
+class Deadline:
+    def __init__(self, timeBudget):
+        self.end = perf_counter() + timeBudget
+
+    # Returns whether the time has run out
+    def hasPassed(self):
+        return perf_counter() >= self.end
+
+# The tournament layouts found by a search
+# It is a list of the layouts, which also records whether every layout was searched and how long each stage of the search took in seconds
+class SearchResult(list):
+    def __init__(self, tournaments = (), complete = True, timings = None):
+        super().__init__(tournaments)
+        self.complete = complete
+        self.timings = timings if timings is not None else {"combos": 0, "binding": 0, "games": 0}
+
+    # Returns whether every layout was searched before the time ran out
+    def isComplete(self):
+        return self.complete
+
+    # Returns how long each stage of the search took in seconds
+    def getTimings(self):
+        return self.timings
+
+# Searches for compact tournament layouts
+# If numOfOptions is given only the best numOfOptions layouts are kept, best first
+# If timeBudget is given the search stops after that many seconds, keeping the best of the layouts found so far
+# If workers is more than 1 the games are spread across that many processes, otherwise they are calculated when they are first accessed
+def search(teams, numOfPitches, halfDuration, halfTimeDuration, swapTeamsDuration, startHour, startMinute, minGroupSize = MIN_GROUP_SIZE, maxGroupSize = MAX_GROUP_SIZE, numOfOptions = None, timeBudget = None, workers = 1):
+    deadline = Deadline(timeBudget) if timeBudget is not None else None
+    startTime = datetime(1970, 1, 1, startHour, startMinute)
+    gameDuration = calculateGameDuration(halfDuration, halfTimeDuration, swapTeamsDuration)
+    timings = {}
+
+    # Finds the shape of each layout, then keeps only the best if needed
+    stageStart = perf_counter()
+    (shapes, complete) = searchShapes(len(teams), numOfPitches, gameDuration, minGroupSize, maxGroupSize, deadline)
+    if numOfOptions is not None:
+        shapes = scoring.getBestShapes(shapes, numOfOptions)
+    timings["combos"] = perf_counter() - stageStart
+
+    # Binds the teams onto each shape, sharing one copy of the list of teams
+    stageStart = perf_counter()
+    teams = list(teams)
+    tournaments = [bindTeams(shape, teams, startTime) for shape in shapes]
+    timings["binding"] = perf_counter() - stageStart
+
+    # Calculates the games for each layout across a process pool
+    # Otherwise the games are left to be calculated when they are first accessed, so every layout found is kept even if the time has run out
+    stageStart = perf_counter()
+    if workers > 1:
+        parallel.calculateGames([tournament.shape for tournament in tournaments], workers)
+    timings["games"] = perf_counter() - stageStart
+
+    return SearchResult(tournaments, complete, timings)
+
 # Function called when progran is run. Takes tournament info as its input and returns list of possible combos.
-def main(teams, numOfPitches, halfDuration, halfTimeDuration, swapTeamsDuration, startHour, startMinute):
+# If compact is true the combos are returned as CompactTournament objects, which have the same accessor API but use far less memory
+# If workers is more than 1 the games for compact tournaments are spread across that many processes for large inputs
+# minGroupSize and maxGroupSize are the smallest and largest number of teams that can play on a pitch in a timeslot
+# If timeBudget is given the combos found within that many seconds are returned
+# The list returned is a SearchResult, which records whether every combo was found and how long each stage took
+def main(teams, numOfPitches, halfDuration, halfTimeDuration, swapTeamsDuration, startHour, startMinute, compact = False, workers = 1, minGroupSize = MIN_GROUP_SIZE, maxGroupSize = MAX_GROUP_SIZE, timeBudget = None):
+    # Compact tournaments are found by search
+    if compact == True:
+        return search(teams, numOfPitches, halfDuration, halfTimeDuration, swapTeamsDuration, startHour, startMinute, minGroupSize, maxGroupSize, None, timeBudget, workers)
+
+    deadline = Deadline(timeBudget) if timeBudget is not None else None
+    complete = True
+    timings = {"combos": 0, "binding": 0, "games": 0}
+
     startTime = datetime(1970, 1, 1, startHour, startMinute)
     gameDuration = timedelta(minutes = calculateGameDuration(halfDuration, halfTimeDuration, swapTeamsDuration))
 
     numOfTeams = len(teams)
     # Calculate the number of timeslots by inputting the number of teams and number of pitches
-    numOfTimeslots = calcNumOfTimeslots(numOfTeams, numOfPitches)
+    numOfTimeslots = calcNumOfTimeslots(numOfTeams, numOfPitches, maxGroupSize)
 
     # Will hold each tournament combo
     tournaments = []
 
     # Will loop until valid combos can no longer be produced
     while True:
+        # If the time has run out no more combos are found, once at least one combo has been found
+        if len(tournaments) > 0 and deadline is not None and deadline.hasPassed() == True:
+            complete = False
+            break
+
         # Holds the valid tournament layouts for the number of timeslots the loop is being repeated for
-        combos = calcTeamsOnPitchesCombos(numOfTeams, numOfPitches, numOfTimeslots)
+        stageStart = perf_counter()
+        combos = calcTeamsOnPitchesCombos(numOfTeams, numOfPitches, numOfTimeslots, minGroupSize, maxGroupSize)
+        timings["combos"] += perf_counter() - stageStart
 
         # If no valid combos were made then no more valid combos can be made so break the loop
         if combos == []:
@@ -402,27 +550,39 @@ def main(teams, numOfPitches, halfDuration, halfTimeDuration, swapTeamsDuration,
         # If valid combos were produced
         else:
             # Implement the combos using tournament object
+            stageStart = perf_counter()
             tournaments.append(createPossibleTournaments(teams, combos, numOfTimeslots))
+            timings["binding"] += perf_counter() - stageStart
             # Incrememnt the number of timeslots by one so the while loop repeats for a greater number of timeslots to find more combos
             numOfTimeslots += 1
 
     # Puts each combo in each sublist into one big list of combos
     tournaments = [j for i in tournaments for j in i]
 
+    stageStart = perf_counter()
+
     # For each tournament layout
-    for tournament in tournaments:
+    for (k, tournament) in enumerate(tournaments):
+        # If the time has run out only the layouts with games are kept, which always includes the first layout
+        if k > 0 and deadline is not None and deadline.hasPassed() == True:
+            tournaments = tournaments[:k]
+            complete = False
+            break
+
         timeslotStartTime = startTime
         # For each timeslot in the tournament
         for i in range(tournament.getNumOfTimeslots()):
             # For each pitch in the timeslot
             for j in range(tournament.timeslot(i).getNumOfPitches()):
-                # The games are calculated for the pitch using the tournament polygon object
-                TournamentPolygon(tournament.timeslot(i).pitch(j)).calculateGames(timeslotStartTime, gameDuration)
+                # The games are calculated for the pitch using the round robin object
+                RoundRobin(tournament.timeslot(i).pitch(j)).calculateGames(timeslotStartTime, gameDuration)
             # Increase the timeslot start time so start time is correct for games in the next timeslot
             timeslotStartTime += timedelta(seconds = gameDuration.seconds * tournament.timeslot(i).pitch(0).getNumOfGames())
 
         # The duration of the tournament is now calculated now that all games have been added
         tournament.calculateDuration(gameDuration)
 
+    timings["games"] = perf_counter() - stageStart
+
     # The valid tournament layouts are returned
-    return tournaments
+    return SearchResult(tournaments, complete, timings)
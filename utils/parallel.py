@@ -0,0 +1,47 @@
+# ProcessPoolExecutor runs functions in separate processes so more than one core can be used
+from concurrent.futures import ProcessPoolExecutor
+
+# Lock prevents two requests from creating a process pool at the same time
+from threading import Lock
+
+# Below this many games in total it is quicker to calculate the games in this process than to send the layouts to other processes
+# Sending the games back costs about as much as a tenth of calculating them, so the pool needs a few hundred teams to pay off
+# Run benchmarks/parallel.py on the machine the site is deployed to in order to tune this
+PARALLEL_THRESHOLD = 40000
+
+# The process pools are kept between calls, as starting new processes takes longer than calculating the games for most tournaments
+pools = {}
+poolsLock = Lock()
+
+# Returns the process pool with the given number of workers, creating it if needed
+def getPool(workers):
+    with poolsLock:
+        if workers not in pools:
+            pools[workers] = ProcessPoolExecutor(max_workers = workers)
+        return pools[workers]
+
+# Calculates the games for a layout shape in a worker process and returns them
+def calculateShapeGames(shape):
+    shape.calculateGames()
+    return shape.team1s, shape.team2s, shape.startMinutes
+
+# Calculates the games for each layout shape that does not already have them
+# Each layout is independent, so they are spread across a pool of worker processes
+# If workers is 1, or there are fewer games than the threshold, the games are calculated in this process instead
+def calculateGames(shapes, workers = 1, threshold = PARALLEL_THRESHOLD):
+    shapes = [shape for shape in shapes if shape.hasGames() == False]
+    numOfGames = sum(shape.groupGames[-1] for shape in shapes)
+
+    # Serial fallback for small inputs
+    if workers == 1 or len(shapes) < 2 or numOfGames < threshold:
+        for shape in shapes:
+            shape.getGames()
+        return
+
+    # Each worker is given a few layouts at a time to reduce the number of messages between processes
+    chunkSize = max(1, len(shapes) // (workers * 4))
+
+    for (shape, games) in zip(shapes, getPool(workers).map(calculateShapeGames, shapes, chunksize = chunkSize)):
+        # Another request may have calculated the games for a shared shape in the meantime
+        if shape.hasGames() == False:
+            shape.setGames(*games)
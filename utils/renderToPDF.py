@@ -10,12 +10,13 @@ from django.template.loader import get_template
 # pisa converts HTML code to a PDF document
 from xhtml2pdf import pisa
 
-# Takes a tournament and produces the PDF document associated with it
-def renderToPDF(tournament):
+# Takes a tournament and its timeslots, with their pitches and games, and produces the PDF document associated with it
+def renderToPDF(tournament, timeslots):
     # Renders the template for a specific tournament and holds the html code
     template = get_template("tournament/PDF.html")
     html  = template.render({
-        "tournament": tournament
+        "tournament": tournament,
+        "timeslots": timeslots
     })
 
     # Will hold the bytes that make up the PDF document
@@ -0,0 +1,95 @@
+# array stores the team indexes as machine integers rather than as a list of Python objects
+from array import array
+
+# Returns the number of vertices on the tournament polygon for a given number of teams
+# If the number of teams is even one team sits in the centre of the polygon, so there is one less vertex than there are teams
+def calcNumOfVertices(numOfTeams):
+    if numOfTeams % 2 == 0:
+        return numOfTeams - 1
+    else:
+        return numOfTeams
+
+# Returns the number of rounds and the number of games in each round for a given number of teams
+def calcRoundsAndSlots(numOfTeams):
+    numOfVertices = calcNumOfVertices(numOfTeams)
+
+    # There is one round for each vertex, as the polygon rotates until it is back to its initial orientation
+    # Each team plays the team horizontally opposite from it, and the centre team (if there is one) plays the team at the top
+    return numOfVertices, numOfTeams // 2
+
+# Returns the total number of games played by a given number of teams
+def calcNumOfGames(numOfTeams):
+    (numOfRounds, numOfSlots) = calcRoundsAndSlots(numOfTeams)
+    return numOfRounds * numOfSlots
+
+# Writes the pairings for a given number of teams into the team1s and team2s arrays, starting at offset
+# The pairing for each round and slot is calculated directly using the circle method, producing the same games in the same order as TournamentPolygon
+def fillPairings(numOfTeams, team1s, team2s, offset = 0):
+    numOfVertices = calcNumOfVertices(numOfTeams)
+    (numOfRounds, numOfSlots) = calcRoundsAndSlots(numOfTeams)
+    hasCentre = numOfVertices != numOfTeams
+
+    # The number of pairs of teams horizontally opposite each other on the polygon
+    numOfOppositeSlots = numOfVertices // 2
+
+    # Team indexes around the polygon repeated twice, so each rotation is a contiguous slice rather than a calculation per game
+    vertices = array("i", range(numOfVertices)) * 2
+
+    k = offset
+    for round in range(numOfRounds):
+        # Rotating the polygon round times moves the team at vertex i to vertex i + round
+        # The first teams are read anticlockwise from the vertex just before the top, the second teams clockwise from the bottom
+        firstTeamStart = 2 * numOfVertices - 2 - round
+        secondTeamStart = numOfVertices - round
+        team1s[k:k + numOfOppositeSlots] = vertices[firstTeamStart:firstTeamStart - numOfOppositeSlots:-1]
+        team2s[k:k + numOfOppositeSlots] = vertices[secondTeamStart:secondTeamStart + numOfOppositeSlots]
+        k += numOfOppositeSlots
+
+        # The centre team is always the last team and plays the team at the top of the polygon
+        if hasCentre == True:
+            team1s[k] = numOfVertices - 1 - round
+            team2s[k] = numOfTeams - 1
+            k += 1
+
+    # Returns the index after the last pairing written
+    return k
+
+# Returns two preallocated arrays holding the index of the first and second team in each game
+def calcPairings(numOfTeams):
+    numOfGames = calcNumOfGames(numOfTeams)
+    team1s = array("i", bytes(numOfGames * array("i").itemsize))
+    team2s = array("i", bytes(numOfGames * array("i").itemsize))
+
+    fillPairings(numOfTeams, team1s, team2s)
+
+    return team1s, team2s
+
+# Drop-in replacement for TournamentPolygon that calculates the games for a pitch from team indexes
+class RoundRobin:
+    def __init__(self, pitch):
+        self.pitch = pitch
+
+        # If the pitch needs a bye team then a bye team is added to the pitch
+        if pitch.doesPitchNeedBye() == True:
+            self.pitch.addByeTeam()
+            # The bye team is always the last team added to the pitch
+            self.byeIndex = pitch.getNumOfTeams() - 1
+        else:
+            self.byeIndex = -1
+
+        (self.team1s, self.team2s) = calcPairings(pitch.getNumOfTeams())
+
+    # Adds games to the pitch
+    def calculateGames(self, startTime, gameDuration):
+        gameTime = startTime
+        teams = self.pitch.teams
+        byeIndex = self.byeIndex
+
+        for (team1, team2) in zip(self.team1s, self.team2s):
+            # If the game is a bye game then the game start time is the same as the previous game
+            if team1 == byeIndex or team2 == byeIndex:
+                self.pitch.addGame(teams[team1].getTeam(), teams[team2].getTeam(), gameTime - gameDuration)
+            # If the game is not a bye game then the start time is incremented
+            else:
+                self.pitch.addGame(teams[team1].getTeam(), teams[team2].getTeam(), gameTime)
+                gameTime += gameDuration
@@ -0,0 +1,95 @@
+# Counter counts how many groups of each kind there are in a layout
+from collections import Counter
+
+# lru_cache remembers the back-to-back games for each kind of group, so they are only worked out once
+from functools import lru_cache
+
+# heapq keeps only the best layouts while looking through all of them
+import heapq
+
+# Calculates the games on a pitch directly from round and slot indexes
+from utils.roundRobin import calcPairings
+
+# How much each part of the score counts for, in minutes of tournament duration
+# A team playing two games in a row is worse than a few extra minutes, and a bye game is worse than a pitch sitting idle
+BACK_TO_BACK_WEIGHT = 15
+BYE_WEIGHT = 5
+IDLE_WEIGHT = 0.5
+DURATION_WEIGHT = 1
+
+# Returns the number of times a team in a group plays two games in a row with no rest in between
+# Bye games take no time so they do not count as a rest
+@lru_cache(maxsize = None)
+def calcGroupBackToBack(numOfTeams, hasBye):
+    byeIndex = numOfTeams if hasBye == True else -1
+    (team1s, team2s) = calcPairings(numOfTeams + hasBye)
+
+    # The position of the last game each team played in
+    lastSlot = [None] * (numOfTeams + hasBye)
+
+    backToBack = 0
+    slot = 0
+    for (team1, team2) in zip(team1s, team2s):
+        if team1 == byeIndex or team2 == byeIndex:
+            continue
+
+        for team in (team1, team2):
+            if lastSlot[team] == slot - 1:
+                backToBack += 1
+            lastSlot[team] = slot
+
+        slot += 1
+
+    return backToBack
+
+# Returns the parts of the score for a layout shape
+# The back-to-back games are worked out once for each kind of group, then multiplied by the number of groups of that kind
+def calcScoreParts(shape):
+    groups = Counter(zip(shape.groupSizes, shape.groupHasBye))
+
+    backToBack = 0
+    byeGames = 0
+    for ((size, hasBye), count) in groups.items():
+        backToBack += count * calcGroupBackToBack(size, hasBye)
+        if hasBye == True:
+            byeGames += count * size
+
+    # A pitch is idle in a timeslot while it waits for the first pitch to finish, including any pitch not used in the timeslot
+    maxNumOfPitches = shape.timeslotGroups[1] - shape.timeslotGroups[0]
+    idleGames = 0
+    for timeslot in range(shape.getNumOfTimeslots()):
+        firstGroup = shape.timeslotGroups[timeslot]
+        lastGroup = shape.timeslotGroups[timeslot + 1]
+        timeslotLength = shape.getNumOfGames(firstGroup)
+
+        for group in range(firstGroup, lastGroup):
+            idleGames += timeslotLength - (shape.getNumOfGames(group) - shape.getNumOfByeGames(group))
+        idleGames += (maxNumOfPitches - (lastGroup - firstGroup)) * timeslotLength
+
+    return {
+        "backToBack": backToBack,
+        "idleMinutes": idleGames * shape.gameDuration,
+        "byeGames": byeGames,
+        "duration": shape.duration
+    }
+
+# Returns the score for each layout shape, where lower scores are better
+def calcScores(shapes):
+    scores = []
+
+    for shape in shapes:
+        parts = calcScoreParts(shape)
+        scores.append(
+            BACK_TO_BACK_WEIGHT * parts["backToBack"]
+            + IDLE_WEIGHT * parts["idleMinutes"]
+            + BYE_WEIGHT * parts["byeGames"]
+            + DURATION_WEIGHT * parts["duration"]
+        )
+
+    return scores
+
+# Returns the k best layout shapes in order, best first
+# Only k shapes are kept on the heap at a time, and layouts with the same score stay in the order they were generated in
+def getBestShapes(shapes, k):
+    scores = calcScores(shapes)
+    return [shapes[i] for i in heapq.nsmallest(k, range(len(shapes)), key = scores.__getitem__)]
@@ -0,0 +1,50 @@
+# OrderedDict remembers the order keys were last used in, so the least recently used shapes can be removed first
+from collections import OrderedDict
+
+# Lock prevents two requests from changing the cache at the same time
+from threading import Lock
+
+# Least recently used cache of layout shapes
+# The shapes for a tournament only depend on the number of teams, the number of pitches and the game duration, so they can be shared between tournaments
+class ShapeCache:
+    def __init__(self, maxSize):
+        self.maxSize = maxSize
+        self.shapes = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # Returns the shapes stored for the key, or None if they are not cached
+    def get(self, key):
+        with self.lock:
+            if key in self.shapes:
+                self.shapes.move_to_end(key)
+                self.hits += 1
+                return self.shapes[key]
+            else:
+                self.misses += 1
+                return None
+
+    # Returns whether shapes are stored for the key, without counting it as a use
+    def contains(self, key):
+        with self.lock:
+            return key in self.shapes
+
+    # Stores the shapes for the key, removing the least recently used shapes if the cache is full
+    def put(self, key, shapes):
+        with self.lock:
+            self.shapes[key] = shapes
+            self.shapes.move_to_end(key)
+            while len(self.shapes) > self.maxSize:
+                self.shapes.popitem(last = False)
+
+    # Removes every shape from the cache
+    def clear(self):
+        with self.lock:
+            self.shapes.clear()
+            self.hits = 0
+            self.misses = 0
+
+# The cache shared by every request in the process
+# A few hundred shapes covers every common combination of teams, pitches and game duration
+shapeCache = ShapeCache(maxSize = 256)
@@ -0,0 +1,209 @@
+from datetime import datetime, timedelta
+
+from django.test import SimpleTestCase
+
+from . import organise, parallel, roundRobin, scoring
+from .shapeCache import shapeCache, ShapeCache
+
+class RoundRobinTestCase(SimpleTestCase):
+    # Creates a pitch with a given number of teams, optionally needing a bye team
+    def createPitch(self, numOfTeams, needsBye):
+        pitch = organise.Pitch()
+        for i in range(numOfTeams):
+            pitch.addTeam("Team {}".format(i))
+        if needsBye == True:
+            pitch.needsBye()
+        return pitch
+
+    def test_pairings_match_polygon(self):
+        for numOfTeams in range(1, 12):
+            polygonGames = organise.TournamentPolygon(self.createPitch(numOfTeams, False)).getGames()
+            expected = [(game[0].getTeam(), game[1].getTeam()) for round in polygonGames for game in round]
+
+            (team1s, team2s) = roundRobin.calcPairings(numOfTeams)
+            actual = [("Team {}".format(i), "Team {}".format(j)) for (i, j) in zip(team1s, team2s)]
+
+            self.assertEqual(actual, expected)
+
+    def test_games_match_polygon(self):
+        startTime = datetime(1970, 1, 1, 10, 0)
+        gameDuration = timedelta(minutes = 20)
+
+        for numOfTeams in range(2, 9):
+            for needsBye in (False, True):
+                polygonPitch = self.createPitch(numOfTeams, needsBye)
+                organise.TournamentPolygon(polygonPitch).calculateGames(startTime, gameDuration)
+
+                roundRobinPitch = self.createPitch(numOfTeams, needsBye)
+                roundRobin.RoundRobin(roundRobinPitch).calculateGames(startTime, gameDuration)
+
+                self.assertEqual(
+                    [(game.getGame(), game.getStartTime()) for game in roundRobinPitch.games],
+                    [(game.getGame(), game.getStartTime()) for game in polygonPitch.games]
+                )
+
+class CombosTestCase(SimpleTestCase):
+    def test_combos_for_timeslots(self):
+        self.assertEqual(organise.calcNumOfTimeslots(20, 2), 2)
+        self.assertEqual(organise.calcTeamsOnPitchesCombos(20, 2, 2), [[5, 5, 5, 5]])
+        self.assertEqual(organise.calcTeamsOnPitchesCombos(20, 2, 3), [[4, 4, 3, 3, 3, 3], [4, 4, 4, 4, 4]])
+        self.assertEqual(organise.calcTeamsOnPitchesCombos(20, 2, 4), [])
+
+    def test_group_size_limits(self):
+        self.assertEqual(organise.calcNumOfTimeslots(40, 2, maxGroupSize = 8), 3)
+        self.assertEqual(organise.calcTeamsOnPitchesCombos(40, 2, 3, minGroupSize = 6, maxGroupSize = 8), [[7, 7, 7, 7, 6, 6], [8, 8, 8, 8, 8]])
+
+        for (combo, numOfTimeslots, maxNumOfPitchesPerTimeslot) in organise.iterCombos(100, 3, 6, 8):
+            self.assertEqual(sum(combo), 100)
+            self.assertTrue(all(6 <= size <= 8 for size in combo))
+
+    def test_teams_are_distributed_in_order(self):
+        teams = ["Team {}".format(i) for i in range(20)]
+        combos = organise.calcTeamsOnPitchesCombos(20, 2, 3)
+        tournaments = organise.createPossibleTournaments(teams, combos, 3)
+
+        for (tournament, combo) in zip(tournaments, combos):
+            pitches = [tournament.timeslot(i).pitch(j) for i in range(tournament.getNumOfTimeslots()) for j in range(tournament.timeslot(i).getNumOfPitches())]
+            self.assertEqual([pitch.getNumOfTeams() for pitch in pitches], combo)
+            self.assertEqual([pitch.team(k).getTeam() for pitch in pitches for k in range(pitch.getNumOfTeams())], teams)
+            self.assertEqual([pitch.doesPitchNeedBye() for pitch in pitches], [size < combo[0] for size in combo])
+
+    def test_enumerated_layouts_are_all_different(self):
+        # Layouts which only differ in the order of the pitches within a timeslot have the same fingerprint
+        shape = organise.createLayoutShape(1, [5, 4, 5, 4], 2, 2, 25)
+        self.assertEqual(shape.getFingerprint(), organise.createLayoutShape(2, [5, 4, 4, 5], 2, 2, 25).getFingerprint())
+        self.assertNotEqual(shape.getFingerprint(), organise.createLayoutShape(3, [5, 5, 4, 4], 2, 2, 25).getFingerprint())
+
+        # The enumeration never produces two equivalent layouts, so none need to be removed
+        for (numOfTeams, numOfPitches, minGroupSize, maxGroupSize) in ((60, 4, 3, 5), (97, 7, 3, 8), (250, 12, 2, 10)):
+            teams = ["Team {}".format(i) for i in range(numOfTeams)]
+            fingerprints = [tournament.getFingerprint() for tournament in organise.iterTournaments(teams, numOfPitches, 10, 5, 3, 10, 30, minGroupSize, maxGroupSize)]
+            self.assertEqual(len(set(fingerprints)), len(fingerprints))
+
+class CompactTournamentTestCase(SimpleTestCase):
+    def setUp(self):
+        shapeCache.clear()
+
+    # Returns every game in a tournament, along with its summary information, as nested lists
+    def flatten(self, tournament):
+        return [
+            tournament.getDuration(),
+            tournament.getNumOfByeGames(),
+            tournament.getNumOfNonByeGames(),
+            [[[(tournament.timeslot(i).pitch(j).game(k).getGame(), tournament.timeslot(i).pitch(j).game(k).getStartTime())
+                for k in range(tournament.timeslot(i).pitch(j).getNumOfGames())]
+                for j in range(tournament.timeslot(i).getNumOfPitches())]
+                for i in range(tournament.getNumOfTimeslots())]
+        ]
+
+    def test_matches_tournament_objects(self):
+        for numOfTeams in range(3, 30):
+            for numOfPitches in range(1, 5):
+                teams = ["Team {}".format(i) for i in range(numOfTeams)]
+                tournaments = organise.main(teams, numOfPitches, 10, 5, 3, 10, 30)
+                compactTournaments = organise.main(teams, numOfPitches, 10, 5, 3, 10, 30, compact = True)
+
+                self.assertEqual([self.flatten(t) for t in compactTournaments], [self.flatten(t) for t in tournaments])
+
+    def test_games_are_calculated_lazily(self):
+        teams = ["Team {}".format(i) for i in range(20)]
+        tournaments = list(organise.iterTournaments(teams, 2, 10, 5, 3, 10, 30))
+
+        self.assertFalse(any(tournament.hasGames() for tournament in tournaments))
+        tournaments[0].getDuration()
+        self.assertFalse(tournaments[0].hasGames())
+        tournaments[0].timeslot(0).pitch(0).game(0).getGame()
+        self.assertTrue(tournaments[0].hasGames())
+
+    def test_get_tournament_matches_main(self):
+        teams = ["Team {}".format(i) for i in range(20)]
+        tournaments = organise.main(teams, 3, 10, 5, 3, 10, 30, compact = True)
+
+        for num in range(1, len(tournaments) + 1):
+            tournament = organise.getTournament(teams, 3, 10, 5, 3, 10, 30, num)
+            self.assertEqual(self.flatten(tournament), self.flatten(tournaments[num - 1]))
+
+        self.assertIsNone(organise.getTournament(teams, 3, 10, 5, 3, 10, 30, len(tournaments) + 1))
+        self.assertIsNone(organise.getTournament(teams, 3, 10, 5, 3, 10, 30, 0))
+
+    def test_parallel_games_match_serial(self):
+        teams = ["Team {}".format(i) for i in range(40)]
+        serial = organise.main(teams, 3, 10, 5, 3, 10, 30, compact = True)
+        expected = [self.flatten(tournament) for tournament in serial]
+
+        shapeCache.clear()
+        tournaments = organise.main(teams, 3, 10, 5, 3, 10, 30, compact = True)
+        parallel.calculateGames([tournament.shape for tournament in tournaments], workers = 2, threshold = 0)
+
+        self.assertTrue(all(tournament.hasGames() for tournament in tournaments))
+        self.assertEqual([self.flatten(tournament) for tournament in tournaments], expected)
+
+    def test_time_budget_truncates_search(self):
+        teams = ["Team {}".format(i) for i in range(40)]
+
+        # The layouts found before the time ran out are returned
+        truncated = organise.main(teams, 3, 10, 5, 3, 10, 30, compact = True, timeBudget = 0)
+        self.assertFalse(truncated.isComplete())
+        self.assertGreater(len(truncated), 0)
+        # A truncated search is not cached, so a later search still finds every layout
+        self.assertEqual(shapeCache.misses, 1)
+        self.assertEqual(len(organise.getBestTournaments(teams, 3, 10, 5, 3, 10, 30, numOfOptions = 5, timeBudget = 0)), 1)
+        self.assertGreater(len(organise.main(teams, 3, 10, 5, 3, 10, 30, timeBudget = 0)), 0)
+
+        tournaments = organise.main(teams, 3, 10, 5, 3, 10, 30, compact = True, timeBudget = 60)
+        self.assertTrue(tournaments.isComplete())
+        self.assertEqual(len(tournaments), len(organise.main(teams, 3, 10, 5, 3, 10, 30)))
+        self.assertEqual(set(tournaments.getTimings()), {"combos", "binding", "games"})
+
+class ShapeCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        shapeCache.clear()
+
+    def test_shapes_are_shared_between_teams(self):
+        teams = ["Team {}".format(i) for i in range(12)]
+        otherTeams = ["Other {}".format(i) for i in range(12)]
+
+        tournaments = organise.main(teams, 2, 10, 5, 3, 10, 30, compact = True)
+        otherTournaments = organise.main(otherTeams, 2, 10, 5, 3, 11, 30, compact = True)
+
+        self.assertEqual(shapeCache.misses, 1)
+        self.assertEqual(shapeCache.hits, 1)
+        self.assertIs(tournaments[0].shape, otherTournaments[0].shape)
+        self.assertEqual(otherTournaments[0].timeslot(0).pitch(0).game(0).getGame(), [name.replace("Team", "Other") for name in tournaments[0].timeslot(0).pitch(0).game(0).getGame()])
+        self.assertEqual(otherTournaments[0].timeslot(0).pitch(0).game(0).getStartTime() - tournaments[0].timeslot(0).pitch(0).game(0).getStartTime(), timedelta(hours = 1))
+
+    def test_least_recently_used_shapes_are_removed(self):
+        cache = ShapeCache(maxSize = 2)
+        cache.put(1, "a")
+        cache.put(2, "b")
+        cache.get(1)
+        cache.put(3, "c")
+
+        self.assertEqual(cache.get(1), "a")
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.get(3), "c")
+
+class ScoringTestCase(SimpleTestCase):
+    def setUp(self):
+        shapeCache.clear()
+
+    def test_back_to_back_games(self):
+        # With three teams every team plays two of the three games in a row, apart from the team in the middle game
+        self.assertEqual(scoring.calcGroupBackToBack(3, False), 2)
+        # With seven teams no team ever plays two games in a row
+        self.assertEqual(scoring.calcGroupBackToBack(7, False), 0)
+
+    def test_best_tournaments_are_ranked_by_score(self):
+        teams = ["Team {}".format(i) for i in range(60)]
+        shapes = organise.getShapes(60, 4, 30)
+        scores = scoring.calcScores(shapes)
+
+        best = organise.getBestTournaments(teams, 4, 10, 5, 3, 10, 30, numOfOptions = 3)
+
+        self.assertEqual(len(best), 3)
+        self.assertEqual([scores[tournament.getNumber() - 1] for tournament in best], sorted(scores)[:3])
+        self.assertFalse(any(tournament.hasGames() for tournament in best))
+
+        # The number of each option chooses the same layout
+        for tournament in best:
+            self.assertIs(organise.getTournament(teams, 4, 10, 5, 3, 10, 30, tournament.getNumber()).shape, tournament.shape)